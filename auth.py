@@ -0,0 +1,165 @@
+# ==========================================
+# AUTHENTICATION — PASSWORD HASHING & USER LOOKUP
+# ==========================================
+# New passwords are stored as salted scrypt (or PBKDF2) strings that carry
+# their own cost parameters, e.g. "scrypt$16384$8$1$<salt>$<hash>". Legacy
+# bare SHA-256 hex digests still verify and are rewritten in the current
+# format after a successful login, off the login path.
+#
+# Login lookups fetch only username/password/role and are cached in-process
+# for a few seconds (misses too), so a shift-start rush of logins costs one
+# request per user rather than one per attempt.
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from db import Query, db_select, db_update, on_write
+
+PASSWORD_SCHEME = os.environ.get("DELVERO_PASSWORD_SCHEME", "scrypt")
+SCRYPT_N = int(os.environ.get("DELVERO_SCRYPT_N", str(2 ** 14)))
+SCRYPT_R = int(os.environ.get("DELVERO_SCRYPT_R", "8"))
+SCRYPT_P = int(os.environ.get("DELVERO_SCRYPT_P", "1"))
+PBKDF2_ITERATIONS = int(os.environ.get("DELVERO_PBKDF2_ITERATIONS", "600000"))
+LOGIN_CACHE_TTL = float(os.environ.get("DELVERO_LOGIN_CACHE_TTL", "30"))
+LOGIN_NEGATIVE_TTL = float(os.environ.get("DELVERO_LOGIN_NEGATIVE_TTL", "5"))
+LOGIN_CACHE_MAX_ENTRIES = int(os.environ.get("DELVERO_LOGIN_CACHE_MAX_ENTRIES", "2048"))
+LOGIN_COLUMNS = ["username", "password", "role"]
+
+# ==========================================
+# PASSWORD HASHING
+# ==========================================
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=132 * n * r * p, dklen=32)
+
+
+def _pbkdf2(password, salt, iterations):
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+
+
+def hash_password(password, scheme=None):
+    scheme = scheme or PASSWORD_SCHEME
+    password = password.strip()
+    salt = secrets.token_bytes(16)
+    if scheme == "scrypt":
+        digest = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+        return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${digest.hex()}"
+    if scheme == "pbkdf2_sha256":
+        digest = _pbkdf2(password, salt, PBKDF2_ITERATIONS)
+        return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${salt.hex()}${digest.hex()}"
+    raise ValueError(f"unknown password scheme {scheme!r}")
+
+
+def _legacy_sha256(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def _current_params(stored):
+    parts = stored.split("$")
+    if PASSWORD_SCHEME == "scrypt":
+        return parts[0] == "scrypt" and parts[1:4] == [str(SCRYPT_N), str(SCRYPT_R), str(SCRYPT_P)]
+    return parts[0] == "pbkdf2_sha256" and parts[1] == str(PBKDF2_ITERATIONS)
+
+
+def verify_password(password, stored):
+    # (matches, needs_rehash); needs_rehash when stored is legacy or uses other cost settings
+    password = password.strip()
+    stored = stored or ""
+    parts = stored.split("$")
+    try:
+        if parts[0] == "scrypt" and len(parts) == 6:
+            n, r, p = (int(x) for x in parts[1:4])
+            digest = _scrypt(password, bytes.fromhex(parts[4]), n, r, p)
+        elif parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+            digest = _pbkdf2(password, bytes.fromhex(parts[2]), int(parts[1]))
+        elif len(stored) == 64:
+            return hmac.compare_digest(_legacy_sha256(password), stored.lower()), True
+        else:
+            return False, False
+    except ValueError:
+        return False, False
+    matches = hmac.compare_digest(digest.hex(), parts[-1])
+    return matches, matches and not _current_params(stored)
+
+
+# compared against when the username does not exist, so a miss takes as long as a wrong password
+_DUMMY_HASH = hash_password(secrets.token_hex(8))
+
+# ==========================================
+# USER LOOKUP CACHE
+# ==========================================
+_lookup_lock = threading.Lock()
+_lookups = {}  # username -> (expires_at, row or None)
+_lookup_stats = {"hits": 0, "misses": 0, "rehashed": 0}
+_rehash_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rehash")
+
+
+def get_login_user(username):
+    now = time.monotonic()
+    with _lookup_lock:
+        entry = _lookups.get(username)
+        if entry and entry[0] > now:
+            _lookup_stats["hits"] += 1
+            return entry[1]
+        _lookup_stats["misses"] += 1
+    # past the session cache: the TTLs above and forget_login decide how long a row is reused
+    rows = db_select("employees", Query(*LOGIN_COLUMNS).eq("username", username).limit(1), session=False)
+    if not isinstance(rows, list):
+        return None  # lookup failed; do not cache
+    user = rows[0] if rows else None
+    ttl = LOGIN_CACHE_TTL if user else LOGIN_NEGATIVE_TTL
+    with _lookup_lock:
+        if len(_lookups) >= LOGIN_CACHE_MAX_ENTRIES:
+            _lookups.clear()
+        _lookups[username] = (now + ttl, user)
+    return user
+
+
+def forget_login(username=None):
+    with _lookup_lock:
+        if username is None:
+            _lookups.clear()
+        else:
+            _lookups.pop(username, None)
+
+
+def login_cache_stats():
+    with _lookup_lock:
+        stats = dict(_lookup_stats)
+        stats["entries"] = len(_lookups)
+    return stats
+
+
+def _rehash(username, password):
+    db_update("employees", Query().eq("username", username), {"password": hash_password(password)})
+    with _lookup_lock:
+        _lookup_stats["rehashed"] += 1
+
+
+def authenticate(username, password):
+    # the user row (username, role) on success, else None
+    username = username or ""
+    user = get_login_user(username) if username else None
+    matches, needs_rehash = verify_password(password or "", user["password"] if user else _DUMMY_HASH)
+    if not user or not matches:
+        return None
+    if needs_rehash:
+        _rehash_executor.submit(_rehash, username, password)
+    return {"username": user["username"], "role": user["role"]}
+
+
+@on_write
+def _login_on_write(table, method, rows):
+    if table != "employees":
+        return
+    if method == "DELETE" or not isinstance(rows, list):
+        forget_login()
+        return
+    for row in rows:
+        if not isinstance(row, dict) or "username" not in row:
+            forget_login()
+            return
+        forget_login(row["username"])
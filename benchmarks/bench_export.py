@@ -0,0 +1,79 @@
+# ==========================================
+# BENCHMARK — STREAMING PAYROLL EXPORT
+# ==========================================
+# python benchmarks/bench_export.py [--rows 1000000] [--formats csv parquet xlsx]
+#
+# Feeds synthetic work_logs pages (1,000 rows, ordered by employee) through
+# the pricing step and export.export_frames. Each format runs in its own
+# process so the reported peak RSS belongs to that export alone.
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from export import export_frames  # noqa: E402
+from payroll import PAYROLL_PAGE_SIZE, logs_frame, price_frame  # noqa: E402
+
+EMPLOYEES = 500
+
+
+def synthetic_chunks(rows, page_size=PAYROLL_PAGE_SIZE, seed=3):
+    rng = np.random.default_rng(seed)
+    price_map = {f"W{i:03d}": float(rng.integers(500, 1200)) for i in range(300)}
+    per_employee = max(rows // EMPLOYEES, 1)
+    days = pd.date_range("2026-01-01", periods=per_employee, freq="D").strftime("%Y-%m-%d")
+    for start in range(0, rows, page_size):
+        n = min(page_size, rows - start)
+        idx = np.arange(start, start + n)
+        frame = pd.DataFrame({
+            "username": [f"emp{i:04d}" for i in idx // per_employee],
+            "manager_username": [f"manager{i % 5}" for i in idx // per_employee // 100],
+            "date": days[idx % per_employee],
+            "wijk": rng.choice(list(price_map) + ["X001", "X002"], size=n),
+            "segments": rng.integers(1, 7, size=n),
+            "trip_km": rng.integers(5, 80, size=n),
+            "status": "approved",
+        })
+        yield price_frame(logs_frame(frame.to_dict("records")), price_map)
+
+
+def run_one(fmt, rows):
+    path = tempfile.mktemp(suffix=f".{fmt}")
+    start = time.perf_counter()
+    stats = export_frames(synthetic_chunks(rows), path)
+    seconds = time.perf_counter() - start
+    size = os.path.getsize(path)
+    os.remove(path)
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{fmt} {stats['rows']} {stats['employees']} {seconds:.2f} {size} {peak_mb:.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--formats", nargs="+", default=["csv", "parquet", "xlsx"])
+    parser.add_argument("--one", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.one:
+        return run_one(args.one, args.rows)
+
+    print(f"{'format':<8} {'rows':>10} {'employees':>10} {'seconds':>8} {'rows/s':>10} "
+          f"{'file MB':>8} {'peak RSS MB':>12}")
+    for fmt in args.formats:
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--one", fmt,
+                              "--rows", str(args.rows)], capture_output=True, text=True, check=True)
+        _, rows, employees, seconds, size, peak = out.stdout.split()
+        print(f"{fmt:<8} {int(rows):>10,} {employees:>10} {float(seconds):>8.1f} "
+              f"{int(rows) / float(seconds):>10,.0f} {int(size) / 2**20:>8.1f} {peak:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# ==========================================
+# BENCHMARK — LOGINS PER SECOND
+# ==========================================
+# python benchmarks/bench_login.py [--scheme scrypt] [--cost 16384] [--users 200] [--threads 8]
+#
+# 1. Raw verify_password throughput at the chosen scheme/cost, on one thread
+#    and on --threads threads (hashlib releases the GIL while hashing).
+# 2. A shift-start rush against postgrest_stub: --users carriers with legacy
+#    SHA-256 hashes log in from --threads threads (lookup, verify, rehash),
+#    then everyone logs in twice more: once re-reading the upgraded hash and
+#    once from the warm lookup cache. Reports logins/s and requests per login.
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def configure(scheme, cost):
+    os.environ["DELVERO_PASSWORD_SCHEME"] = scheme
+    os.environ["DELVERO_SCRYPT_N" if scheme == "scrypt" else "DELVERO_PBKDF2_ITERATIONS"] = str(cost)
+
+
+def timed(fn, items, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(fn, items))
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scheme", choices=["scrypt", "pbkdf2_sha256"], default="scrypt")
+    parser.add_argument("--cost", type=int, help="scrypt N or PBKDF2 iterations (default: auth.py's)")
+    parser.add_argument("--verifies", type=int, default=50)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+    if args.cost:
+        configure(args.scheme, args.cost)
+    else:
+        os.environ["DELVERO_PASSWORD_SCHEME"] = args.scheme
+
+    import auth
+    import db
+    from postgrest_stub import seed_database, start_stub
+
+    stored = auth.hash_password("pass")
+    print(f"scheme {stored.split('$')[0]}, params {'$'.join(stored.split('$')[1:-2])}")
+    for threads in (1, args.threads):
+        results, seconds = timed(lambda _: auth.verify_password("pass", stored)[0],
+                                 range(args.verifies), threads)
+        assert all(results)
+        print(f"verify_password, {threads:>2} thread(s): {args.verifies / seconds:>8.1f} /s "
+              f"({seconds / args.verifies * 1000:.1f} ms each)")
+
+    managers = max(args.users // 40, 1)
+    database = seed_database(managers, args.users // managers, days=1)
+    server, url = start_stub(database)
+    db.SUPABASE_URL = url
+    users = [r["username"] for r in database.tables["employees"] if r["role"] == "employee"]
+
+    print(f"\n{'round':<28} {'logins':>7} {'logins/s':>9} {'req/login':>10}")
+    for label in ("legacy hashes, cold cache", "upgraded hashes, re-read", "upgraded hashes, cached"):
+        before = database.snapshot()["requests"]
+        results, seconds = timed(lambda u: auth.authenticate(u, "pass"), users, args.threads)
+        auth._rehash_executor.submit(lambda: None).result()  # let queued rehashes finish
+        assert all(results)
+        requests = database.snapshot()["requests"] - before
+        print(f"{label:<28} {len(users):>7} {len(users) / seconds:>9.1f} {requests / len(users):>10.2f}")
+    upgraded = sum(r["password"].startswith(args.scheme) for r in database.tables["employees"]
+                   if r["role"] == "employee")
+    print(f"\nupgraded {upgraded}/{len(users)} stored hashes; lookup cache: {auth.login_cache_stats()}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# ==========================================
+# BENCHMARK — SHIFT-END SUBMISSIONS: DIRECT INSERT VS OUTBOX
+# ==========================================
+# python benchmarks/bench_outbox.py [--carriers 200] [--threads 20] [--delay 0.05]
+#
+# --carriers submissions of 3 work logs each arrive from --threads threads
+# against postgrest_stub with --delay seconds added to every insert.
+# "direct" acknowledges after db_insert_many returns; "outbox" after the
+# local SQLite commit, then waits until the background flusher has sent
+# everything. Reports acknowledgement latency, time until all rows are in
+# work_logs, and requests. Then checks an outage (inserts fail with 503
+# until the stub recovers, nothing is lost) and a replayed batch (inserted
+# once). Exits 1 if any row is missing or duplicated.
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("DELVERO_OUTBOX_PATH", os.path.join(tempfile.mkdtemp(), "outbox.sqlite"))
+os.environ.setdefault("DELVERO_OUTBOX_BACKOFF", "0.05")
+
+import db  # noqa: E402
+import outbox  # noqa: E402
+from postgrest_stub import seed_database, start_stub  # noqa: E402
+from views.common import work_log_row  # noqa: E402
+
+
+def submission(i):
+    return [work_log_row(f"emp0_{i % 40}", "manager0", "2026-10-01", f"W{(i + k) % 300:03d}", "Depot 0",
+                         20, "") for k in range(3)]
+
+
+def rush(database, mode, carriers, threads):
+    def submit(i):
+        start = time.perf_counter()
+        if mode == "direct":
+            ok = db.db_insert_many("work_logs", submission(i)) is not None
+        else:
+            ok = bool(outbox.enqueue(submission(i), owner=f"emp0_{i % 40}"))
+        return ok, time.perf_counter() - start
+
+    before = database.snapshot()["requests"]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(submit, range(carriers)))
+    acked = time.perf_counter() - start
+    if mode == "outbox":
+        outbox.wait_outbox(timeout=120)
+    stored = time.perf_counter() - start
+    ack_ms = np.array([seconds for _, seconds in results]) * 1000
+    return {"ok": sum(ok for ok, _ in results), "ack_p50": np.percentile(ack_ms, 50),
+            "ack_p95": np.percentile(ack_ms, 95), "acked_s": acked, "stored_s": stored,
+            "requests": database.snapshot()["requests"] - before}
+
+
+def logs_with_keys(database):
+    with database.lock:
+        keys = [r.get("submission_key") for r in database.tables["work_logs"] if r.get("submission_key")]
+    return len(keys), len(set(keys))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--carriers", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    database = seed_database(1, 40, days=1)
+    server, url = start_stub(database)
+    db.SUPABASE_URL = url
+    database.write_delay = args.delay
+    failures = []
+
+    print(f"{'mode':<8} {'acked':>6} {'ack p50 ms':>11} {'ack p95 ms':>11} {'all acked s':>12} "
+          f"{'all stored s':>13} {'requests':>9}")
+    for mode in ("direct", "outbox"):
+        before = len(database.tables["work_logs"])
+        r = rush(database, mode, args.carriers, args.threads)
+        if len(database.tables["work_logs"]) - before != 3 * args.carriers:
+            failures.append(f"{mode}: {len(database.tables['work_logs']) - before} rows stored, "
+                            f"expected {3 * args.carriers}")
+        print(f"{mode:<8} {r['ok']:>6} {r['ack_p50']:>11.1f} {r['ack_p95']:>11.1f} {r['acked_s']:>12.2f} "
+              f"{r['stored_s']:>13.2f} {r['requests']:>9}")
+
+    # outage: inserts fail until the stub recovers; queued rows survive and land once
+    database.write_delay = 0.0
+    database.fail_writes = 503
+    keys = outbox.enqueue(submission(0) * 10, owner="emp0_0")
+    time.sleep(1.0)
+    during = outbox.outbox_stats()
+    database.fail_writes = 0
+    outbox.retry_dead()
+    drained = outbox.wait_outbox(timeout=60)
+    total, unique = logs_with_keys(database)
+    print(f"\noutage: {len(keys)} rows queued, {during['depth']} waiting and {during['failures']} failed "
+          f"attempts during it; drained after recovery: {drained}")
+    if not drained or total != unique:
+        failures.append(f"outage: drained={drained}, {total - unique} duplicate submission keys")
+
+    # lost response: the same batch sent again inserts nothing
+    rows = [{**row, "submission_key": key} for row, key in zip(submission(1), ["a1", "a2", "a3"])]
+    first = db.db_insert_idempotent("work_logs", rows, "submission_key")[1]
+    again = db.db_insert_idempotent("work_logs", rows, "submission_key")[1]
+    print(f"replayed batch: {len(first)} inserted, then {len(again)} on replay")
+    if len(first) != 3 or again:
+        failures.append("replayed batch inserted twice")
+
+    stats = outbox.outbox_stats()
+    print(f"\noutbox: {stats['flushed']:,} rows in {stats['batches']} batches, flush latency p50 "
+          f"{stats['flush_latency_p50_s']:.2f} s / p95 {stats['flush_latency_p95_s']:.2f} s, "
+          f"batch p50 {stats['batch_p50_ms']:.0f} ms")
+    server.shutdown()
+    for failure in failures:
+        print("FAIL:", failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
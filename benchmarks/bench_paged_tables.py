@@ -0,0 +1,101 @@
+# ==========================================
+# BENCHMARK — PAGED EMPLOYEES & PAYROLL TABLES
+# ==========================================
+# python benchmarks/bench_paged_tables.py [--managers 5] [--employees 40] [--days 60]
+#
+# Drives the Employees and Payroll pages through streamlit's AppTest against
+# postgrest_stub and replays what a user does with the table: open the page,
+# go to the next page, search, sort descending, pick a bigger page size. For
+# every step it reports latency, requests and bytes served by the stand-in,
+# and how many rows went into the dataframe sent to the browser next to the
+# rows the page used to send (the whole table). The employee pages are also
+# checked against the same search and sort done in Python.
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import db  # noqa: E402
+from bench_pages import Meter, new_session  # noqa: E402
+from postgrest_stub import seed_database, start_stub  # noqa: E402
+
+STEPS = [
+    ("open page", lambda at, key: None),
+    ("next page", lambda at, key: at.number_input(key=f"{key}_page").increment()),
+    ("search '1_2'", lambda at, key: at.text_input(key=f"{key}_search").input("1_2")),
+    ("clear search", lambda at, key: at.text_input(key=f"{key}_search").input("")),
+    ("sort descending", lambda at, key: at.toggle(key=f"{key}_desc").set_value(True)),
+    ("250 rows per page", lambda at, key: at.selectbox(key=f"{key}_size").set_value(250)),
+]
+
+
+def replay(database, role, user, menu, key):
+    at = new_session(role, user)
+    at.run()
+    results = []
+    for label, action in STEPS:
+        with Meter(database) as m:
+            if label == "open page":
+                at.sidebar.radio[0].set_value(menu).run()
+            else:
+                action(at, key)
+                at.run()
+        if at.exception:
+            raise RuntimeError(f"{menu} / {label}: {at.exception[0].value}")
+        results.append((label, m, len(at.dataframe[0].value)))
+    return at, results
+
+
+def check_employees(database, at):
+    # the last step shows page 1, 250 rows, sorted by lastname descending
+    expected = sorted((e for e in database.tables["employees"] if e["role"] == "employee"),
+                      key=lambda e: e["lastname"], reverse=True)[:250]
+    shown = at.dataframe[0].value
+    assert sorted(shown["username"]) == sorted(e["username"] for e in expected), "employee page mismatch"
+    at.text_input(key="employees_search").input("carrier1_2").run()
+    expected = [e for e in database.tables["employees"]
+                if e["role"] == "employee" and "carrier1_2" in e["firstname"].lower()]
+    assert sorted(at.dataframe[0].value["username"]) == sorted(e["username"] for e in expected), \
+        "employee search mismatch"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--managers", type=int, default=5)
+    parser.add_argument("--employees", type=int, default=40, help="per manager")
+    parser.add_argument("--days", type=int, default=60)
+    args = parser.parse_args()
+
+    database = seed_database(args.managers, args.employees, args.days)
+    server, url = start_stub(database)
+    db.SUPABASE_URL = url
+    print(f"seeded: {', '.join(f'{t}={len(r):,}' for t, r in database.tables.items())}")
+
+    from datetime import date, timedelta
+    start = date.today() - timedelta(days=30)
+    full = {
+        "employees": sum(e["role"] == "employee" for e in database.tables["employees"]),
+        "payroll": sum(start.isoformat() <= w["date"] for w in database.tables["work_logs"]),
+    }
+    print(f"\n{'table / step':<34} {'ms':>7} {'requests':>9} {'KB served':>10} {'rows sent':>10} "
+          f"{'was':>8}")
+    for role, user, menu, key in [("admin", "admin", "👥 Employees", "employees"),
+                                  ("admin", "admin", "📊 Payroll", "payroll")]:
+        at, results = replay(database, role, user, menu, key)
+        for label, m, rows in results:
+            print(f"{key + ': ' + label:<34} {m.seconds * 1000:>7.0f} {m.requests:>9} "
+                  f"{m.bytes_out / 1024:>10.1f} {rows:>10,} {full[key]:>8,}")
+        if key == "employees":
+            check_employees(database, at)
+    print("\nemployee pages match the same search and sort done in Python")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    main()
+    print(f"total {time.perf_counter() - start:.1f} s")
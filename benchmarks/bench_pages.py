@@ -0,0 +1,164 @@
+# ==========================================
+# BENCHMARK — PAGES AGAINST THE LOCAL POSTGREST STAND-IN
+# ==========================================
+# python benchmarks/bench_pages.py [--managers 5] [--employees 40] [--days 60] [--runs 10]
+#
+# Seeds postgrest_stub with synthetic data, points db.py at it and drives
+# app.py through streamlit's AppTest: one fresh session per page ("first"),
+# then --runs reruns of the same page. Reports latency percentiles plus
+# requests and bytes served per rerun, and times load_payroll directly,
+# including a date window sliding back a week per run with and without the
+# local work_logs cache.
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import db  # noqa: E402
+from postgrest_stub import seed_database, start_stub  # noqa: E402
+
+PAGES = [
+    (None, None, None),
+    ("admin", "admin", "📊 Admin Dashboard"),
+    ("admin", "admin", "👥 Employees"),
+    ("admin", "admin", "📊 Payroll"),
+    ("manager", "manager0", "📊 Manager Dashboard"),
+    ("manager", "manager0", "📝 Approvals"),
+    ("manager", "manager0", "📊 Payroll"),
+    ("employee", "emp0_0", "📝 Submit Work"),
+    ("employee", "emp0_0", "💰 My Earnings"),
+]
+
+
+def percentiles(samples):
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return p50, p95, p99
+
+
+class Meter:
+    def __init__(self, database):
+        self.database = database
+
+    def __enter__(self):
+        self.before = self.database.snapshot()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self.start
+        after = self.database.snapshot()
+        self.requests = after["requests"] - self.before["requests"]
+        self.bytes_out = after["bytes_out"] - self.before["bytes_out"]
+
+
+def new_session(role, user):
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    if role:
+        at.session_state.logged_in = True
+        at.session_state.username = user
+        at.session_state.role = role
+    return at
+
+
+def bench_page(database, role, user, menu, runs):
+    at = new_session(role, user)
+    with Meter(database) as first:
+        at.run()
+        if menu:
+            at.sidebar.radio[0].set_value(menu).run()
+    if at.exception:
+        raise RuntimeError(f"{menu}: {at.exception[0].value}")
+    samples, requests, bytes_out = [], [], []
+    for _ in range(runs):
+        with Meter(database) as m:
+            at.run()
+        samples.append(m.seconds * 1000)
+        requests.append(m.requests)
+        bytes_out.append(m.bytes_out)
+    return first, samples, requests, bytes_out
+
+
+def bench_load_payroll(database, runs):
+    from payroll import load_payroll, PAYROLL_PAGE_SIZE
+    rows = []
+    cases = [
+        ("manager0, all days", dict(manager_filter="manager0", page_size=PAYROLL_PAGE_SIZE)),
+        ("all managers", dict(page_size=PAYROLL_PAGE_SIZE)),
+    ]
+    for label, kwargs in cases:
+        samples = []
+        for _ in range(runs):
+            with Meter(database) as m:
+                df = load_payroll(**kwargs)
+            samples.append(m.seconds * 1000)
+        rows.append((label, len(df), samples, m.requests, m.bytes_out))
+    return rows
+
+
+def bench_sliding_window(database, runs):
+    from payroll import load_payroll, PAYROLL_PAGE_SIZE
+    rows = []
+    for label, cached in (("live", False), ("cached", True)):
+        samples, requests, bytes_out = [], [], []
+        for k in range(runs):
+            end = date.today() - timedelta(days=7 * (k % 4))
+            with Meter(database) as m:
+                df = load_payroll(manager_filter="manager0", start_date=end - timedelta(days=29),
+                                  end_date=end, page_size=PAYROLL_PAGE_SIZE, cached=cached)
+            samples.append(m.seconds * 1000)
+            requests.append(m.requests)
+            bytes_out.append(m.bytes_out)
+        rows.append((f"manager0, sliding 30d, {label}", len(df), samples, requests, bytes_out))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--managers", type=int, default=5)
+    parser.add_argument("--employees", type=int, default=40, help="per manager")
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--wijks", type=int, default=300)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    database = seed_database(args.managers, args.employees, args.days, args.wijks)
+    server, url = start_stub(database)
+    db.SUPABASE_URL = url
+    print(f"seeded: {', '.join(f'{t}={len(r):,}' for t, r in database.tables.items())}")
+
+    print(f"\n{'page':<34} {'first ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'req/run':>8} {'KB/run':>9}")
+    for role, user, menu in PAGES:
+        first, samples, requests, bytes_out = bench_page(database, role, user, menu, args.runs)
+        p50, p95, p99 = percentiles(samples)
+        label = f"{role}: {menu}" if role else "login screen"
+        print(f"{label:<34} {first.seconds * 1000:>9.0f} {p50:>8.0f} {p95:>8.0f} {p99:>8.0f} "
+              f"{np.mean(requests):>8.1f} {np.mean(bytes_out) / 1024:>9.1f}")
+
+    print(f"\n{'load_payroll':<34} {'rows':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'req/run':>8} {'KB/run':>9}")
+    for label, nrows, samples, requests, bytes_out in bench_load_payroll(database, args.runs):
+        p50, p95, p99 = percentiles(samples)
+        print(f"{label:<34} {nrows:>9,} {p50:>8.0f} {p95:>8.0f} {p99:>8.0f} "
+              f"{requests:>8} {bytes_out / 1024:>9.1f}")
+    for label, nrows, samples, requests, bytes_out in bench_sliding_window(database, args.runs):
+        p50, p95, p99 = percentiles(samples)
+        print(f"{label:<34} {nrows:>9,} {p50:>8.0f} {p95:>8.0f} {p99:>8.0f} "
+              f"{np.mean(requests):>8.1f} {np.mean(bytes_out) / 1024:>9.1f}")
+
+    stats = db.http_stats()
+    print(f"\nhttp: {stats['requests']} requests, {stats['opened']} connections opened, "
+          f"reuse rate {stats['reuse_rate']:.0%}; ref cache: {db.cache_stats()}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# ==========================================
+# BENCHMARK — PAYROLL FRAME MEMORY
+# ==========================================
+# python benchmarks/bench_payroll_memory.py [--rows 10000 100000 1000000]
+#
+# Builds the priced payroll frame from synthetic work_logs pages twice: as
+# plain object/float64 columns and through compact_frame + concat_compact
+# (what load_payroll returns). Reports bytes per row for both and fails if
+# any earnings column or total differs between them.
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_export import synthetic_chunks  # noqa: E402
+from payroll import CATEGORY_COLUMNS, compact_frame, concat_compact, frame_totals, memory_per_row  # noqa: E402
+
+EARNINGS = ["Wijk Price (€)", "Trip Cost (€)", "Wijk Earn (€)", "Day Earn (€)"]
+
+
+def check_parity(plain, compact):
+    for c in EARNINGS:
+        if not np.array_equal(plain[c].to_numpy(), compact[c].to_numpy()):
+            raise AssertionError(f"{c} differs after compaction")
+    for c in CATEGORY_COLUMNS + ["segments", "trip_km"]:
+        if not (plain[c].astype(object) == compact[c].astype(object)).all():
+            raise AssertionError(f"{c} values differ after compaction")
+    if frame_totals(plain) != frame_totals(compact):
+        raise AssertionError("frame_totals differ after compaction")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'plain B/row':>12} {'compact B/row':>14} {'saved':>7}  parity")
+    for rows in args.rows:
+        plain = pd.concat(list(synthetic_chunks(rows)), ignore_index=True)
+        compact = concat_compact([compact_frame(df) for df in synthetic_chunks(rows)])
+        check_parity(plain, compact)
+        before, after = memory_per_row(plain), memory_per_row(compact)
+        print(f"{rows:>10,} {before:>12,.0f} {after:>14,.0f} {1 - after / before:>7.0%}  ok")
+    print("\ndtypes:", ", ".join(f"{c}={t}" for c, t in compact.dtypes.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# ==========================================
+# BENCHMARK — MONTH-END PAYROLL RUN
+# ==========================================
+# python benchmarks/bench_payroll_run.py [--managers 4] [--employees 50] [--days 40] [--workers 1 2 4]
+#
+# Runs payroll_run.py against postgrest_stub for the current month with each
+# --workers count, checks the totals and per-employee payslip sums against
+# load_payroll for the same period, and prints wall time, throughput and the
+# requests / wijk reads each run made.
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import db  # noqa: E402
+from payroll import PAYROLL_PAGE_SIZE, TOTALS_FIELDS, frame_totals, load_payroll  # noqa: E402
+from payroll_run import month_range, payroll_run  # noqa: E402
+from postgrest_stub import seed_database, start_stub  # noqa: E402
+
+
+def check(summary, expected, out):
+    errors = [f"total {f}: {summary['totals'][f]} vs {expected[f]}" for f in TOTALS_FIELDS
+              if not np.isclose(summary["totals"][f], expected[f], rtol=1e-9)]
+    slips = os.listdir(os.path.join(out, "payslips"))
+    if len(slips) != summary["paid_employees"]:
+        errors.append(f"{len(slips)} payslips for {summary['paid_employees']} paid employees")
+    earned = sum(pd.read_csv(os.path.join(out, "payslips", name)).query("row_type == 'total'")["Day Earn (€)"].sum()
+                 for name in slips)
+    if not np.isclose(earned, expected["Day Earn (€)"], rtol=1e-9):
+        errors.append(f"payslips add up to {earned}, expected {expected['Day Earn (€)']}")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--managers", type=int, default=4)
+    parser.add_argument("--employees", type=int, default=50, help="per manager")
+    parser.add_argument("--days", type=int, default=40)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    database = seed_database(args.managers, args.employees, args.days)
+    server, url = start_stub(database)
+    db.SUPABASE_URL = url
+    start, end = month_range(date.today().strftime("%Y-%m"))
+    expected = frame_totals(load_payroll(start_date=start, end_date=end, page_size=PAYROLL_PAGE_SIZE,
+                                         cached=False, backend="python"))
+
+    failures = []
+    print(f"{'workers':>7} {'rows':>8} {'employees':>10} {'seconds':>8} {'rows/s':>9} {'requests':>9} "
+          f"{'wijk reads':>11}  result")
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as out:
+            db.invalidate_table("wijk")  # so every run pays for its own price table read
+            before = database.snapshot()
+            clock = time.perf_counter()
+            summary = payroll_run(start, end, out, workers=workers)
+            seconds = time.perf_counter() - clock
+            after = database.snapshot()
+            requests = after["requests"] - before["requests"]
+            wijk_reads = after["by_route"].get("GET wijk", 0) - before["by_route"].get("GET wijk", 0)
+            errors = check(summary, expected, out)
+        failures += errors
+        print(f"{workers:>7} {summary['rows']:>8,} {summary['employees']:>10} {seconds:>8.2f} "
+              f"{summary['rows'] / seconds:>9,.0f} {requests:>9} {wijk_reads:>11}  "
+              f"{'FAIL' if errors else 'ok'}")
+    server.shutdown()
+    for failure in failures:
+        print("MISMATCH:", failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# ==========================================
+# BENCHMARK — PAYROLL PRICING (apply vs vectorized)
+# ==========================================
+# python benchmarks/bench_pricing.py [rows ...]
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from payroll import compute_price, price_rows  # noqa: E402
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def synthetic_logs(rows, seed=42):
+    rng = np.random.default_rng(seed)
+    known = [f"W{i:03d}" for i in range(300)]
+    unknown = [f"X{i:03d}" for i in range(100)]
+    price_map = {name: float(rng.integers(500, 1200)) for name in known}
+    df = pd.DataFrame({
+        "wijk": rng.choice(known + unknown, size=rows),
+        "segments": rng.integers(0, 7, size=rows).astype(float),
+    })
+    return df, price_map
+
+
+def legacy_price(df, price_map):
+    return df.apply(lambda r: compute_price(r["wijk"], r["segments"], price_map), axis=1)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main(sizes):
+    print(f"{'rows':>10} {'apply rows/s':>14} {'vector rows/s':>14} {'speedup':>9}  identical")
+    for rows in sizes:
+        df, price_map = synthetic_logs(rows)
+        old, old_s = timed(lambda: legacy_price(df, price_map))
+        new, new_s = timed(lambda: price_rows(df["wijk"], df["segments"], price_map))
+        same = np.array_equal(old.to_numpy(dtype=float), new.to_numpy(dtype=float))
+        print(f"{rows:>10,} {rows / old_s:>14,.0f} {rows / new_s:>14,.0f} {old_s / new_s:>8.0f}x  {same}")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or DEFAULT_SIZES)
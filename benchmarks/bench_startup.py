@@ -0,0 +1,92 @@
+# ==========================================
+# BENCHMARK — SCRIPT STARTUP AND RERUN TIME PER PAGE
+# ==========================================
+# python benchmarks/bench_startup.py [--runs 20] [--app app.py]
+#
+# Each page runs in a fresh process so "startup" includes every import the
+# page triggers: the first AppTest run of the login screen, or of the page
+# right after login. "rerun" is the median of --runs further reruns of the
+# same page. Also reports how many modules the first run imported and
+# whether pandas was among them. --app allows timing another revision of
+# app.py (e.g. `git show HEAD~1:app.py > old_app.py`) against the same stub.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = [
+    (None, None, None),
+    ("admin", "admin", "📊 Admin Dashboard"),
+    ("admin", "admin", "👥 Employees"),
+    ("admin", "admin", "📊 Payroll"),
+    ("manager", "manager0", "📊 Manager Dashboard"),
+    ("manager", "manager0", "📝 Approvals"),
+    ("employee", "emp0_0", "📝 Submit Work"),
+    ("employee", "emp0_0", "💰 My Earnings"),
+    ("employee", "emp0_0", "👤 Profile"),
+]
+
+
+def run_one(app, role, user, menu, runs):
+    import db
+    from postgrest_stub import seed_database, start_stub
+    from streamlit.testing.v1 import AppTest
+
+    server, url = start_stub(seed_database(2, 20, 30))
+    db.SUPABASE_URL = url
+    at = AppTest.from_file(app, default_timeout=120)
+    if role:
+        at.session_state.logged_in = True
+        at.session_state.username = user
+        at.session_state.role = role
+    before = set(sys.modules)
+    start = time.perf_counter()
+    at.run()
+    if menu:
+        at.sidebar.radio[0].set_value(menu).run()
+    first = time.perf_counter() - start
+    imported = set(sys.modules) - before
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        at.run()
+        samples.append(time.perf_counter() - start)
+    server.shutdown()
+    print(json.dumps({"first_ms": first * 1000, "rerun_ms": float(np.median(samples)) * 1000,
+                      "modules": len(imported), "pandas": "pandas" in imported}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--app", default=os.path.join(ROOT, "app.py"))
+    parser.add_argument("--one", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    app = os.path.abspath(args.app)
+    if args.one:
+        role, user, menu = (None if v == "-" else v for v in args.one)
+        return run_one(app, role, user, menu, args.runs)
+
+    print(f"{'page':<34} {'startup ms':>11} {'rerun ms':>9} {'modules':>8} {'pandas':>7}")
+    for role, user, menu in PAGES:
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--app", app,
+                              "--runs", str(args.runs), "--one", role or "-", user or "-", menu or "-"],
+                             capture_output=True, text=True, check=True, cwd=ROOT)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        label = f"{role}: {menu}" if role else "login screen"
+        print(f"{label:<34} {result['first_ms']:>11.0f} {result['rerun_ms']:>9.1f} "
+              f"{result['modules']:>8} {'yes' if result['pandas'] else 'no':>7}")
+
+
+if __name__ == "__main__":
+    main()
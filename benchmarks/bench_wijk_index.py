@@ -0,0 +1,59 @@
+# ==========================================
+# BENCHMARK — WIJK INDEX VS LINEAR SCAN
+# ==========================================
+# python benchmarks/bench_wijk_index.py [--wijks 300 3000 30000] [--lookups 20000]
+#
+# For each table size: time to build the index, µs per name lookup through
+# the old `next(w for w in wijks if ...)` scan and through WijkIndex.resolve
+# (exact and normalized spellings), µs per 8-name autocomplete, and what a
+# Submit Work rerun used to pay for sorting every name.
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wijk_index import WijkIndex  # noqa: E402
+
+
+def per_call_us(fn, items):
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--wijks", type=int, nargs="+", default=[300, 3000, 30000])
+    parser.add_argument("--lookups", type=int, default=20000)
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    print(f"{'wijks':>7} {'build ms':>9} {'sort ms':>8} {'scan µs':>9} {'exact µs':>9} {'typed µs':>9} "
+          f"{'complete µs':>12}")
+    for n in args.wijks:
+        rows = [{"wijk_name": f"W{i:05d}", "depot": f"Depot {i % 7}", "segments": 3, "base_price": 700.0,
+                 "created_by": "manager0"} for i in range(n)]
+        names = [rng.choice(rows)["wijk_name"] for _ in range(args.lookups)]
+        typed = [f" {name.lower()[:2]}-{name[2:]}" for name in names]
+        start = time.perf_counter()
+        index = WijkIndex(rows)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        sorted(w["wijk_name"] for w in rows)
+        sort = time.perf_counter() - start
+        scans = names[:max(args.lookups // max(n // 300, 1), 100)]
+        scan = per_call_us(lambda name: next((w for w in rows if w["wijk_name"] == name), None), scans)
+        exact = per_call_us(index.resolve, names)
+        fuzzy = per_call_us(index.resolve, typed)
+        assert all(index.resolve(t)["wijk_name"] == name for t, name in zip(typed[:100], names[:100]))
+        complete = per_call_us(lambda name: index.complete(name[:3], 8), names[:2000])
+        print(f"{n:>7,} {build * 1000:>9.1f} {sort * 1000:>8.2f} {scan:>9.1f} {exact:>9.2f} {fuzzy:>9.2f} "
+              f"{complete:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
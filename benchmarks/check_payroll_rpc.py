@@ -0,0 +1,124 @@
+# ==========================================
+# PARITY CHECK — PYTHON VS RPC PAYROLL BACKEND
+# ==========================================
+# python benchmarks/check_payroll_rpc.py [--managers 3] [--employees 20] [--days 45]
+#
+# Seeds postgrest_stub (whose payroll_rows / payroll_summary stand in for
+# sql/payroll_rpc.sql), adds the pricing edge cases (a wijk without a base
+# price, a duplicated wijk name, logs without segments, non-integer
+# segments) and compares load_payroll and payroll_totals between
+# backend="python" and backend="rpc" for several filters. Prints time and
+# bytes per backend; exits 1 on any mismatch.
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import db  # noqa: E402
+from payroll import PAYROLL_PAGE_SIZE, PRICED_COLUMNS, TOTALS_FIELDS, load_payroll, payroll_totals  # noqa: E402
+from postgrest_stub import seed_database, start_stub  # noqa: E402
+
+TEXT = ["username", "date", "wijk", "status", "manager_username", "Day"]
+NUMBERS = ["segments", "trip_km"] + PRICED_COLUMNS
+
+
+def add_edge_cases(database):
+    wijk = database.tables["wijk"]
+    wijk.append({"id": len(wijk) + 1, "wijk_name": "EMPTY", "depot": "Depot 0", "segments": 3,
+                 "base_price": None, "created_by": "manager0"})
+    wijk.append({"id": len(wijk) + 1, "wijk_name": "W000", "depot": "Depot 0", "segments": 3,
+                 "base_price": 999.0, "created_by": "manager0"})  # newer duplicate wins
+    logs = database.tables["work_logs"]
+    template = dict(logs[0])
+    for i, (name, segments) in enumerate([("EMPTY", 2), ("W000", 2), ("X999", None), ("X999", 2.5),
+                                          ("X999", 4), ("X999", 7)]):
+        logs.append({**template, "id": len(logs) + 1, "wijk": name, "wijk_name": name,
+                     "segments": segments, "date": (date.today() - timedelta(days=i)).isoformat()})
+
+
+def sort_frame(df):
+    return df.astype({c: object for c in TEXT}).sort_values(TEXT + NUMBERS).reset_index(drop=True)
+
+
+def compare_frames(label, py, rpc):
+    if list(py.columns) != list(rpc.columns) or len(py) != len(rpc):
+        return f"{label}: shape {py.shape} vs {rpc.shape}, columns {list(py.columns)} vs {list(rpc.columns)}"
+    py, rpc = sort_frame(py), sort_frame(rpc)
+    for c in TEXT:
+        if not (py[c].astype(str) == rpc[c].astype(str)).all():
+            return f"{label}: column {c} differs"
+    for c in NUMBERS:
+        if not np.allclose(py[c].to_numpy(float), rpc[c].to_numpy(float), rtol=1e-12, equal_nan=True):
+            return f"{label}: column {c} differs"
+    return None
+
+
+def compare_totals(label, py, rpc):
+    for field in TOTALS_FIELDS:
+        if not np.isclose(py[field], rpc[field], rtol=1e-9):
+            return f"{label}: total {field} {py[field]} vs {rpc[field]}"
+    return None
+
+
+def timed(database, fn):
+    before = database.snapshot()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    return result, seconds * 1000, (database.snapshot()["bytes_out"] - before["bytes_out"]) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--managers", type=int, default=3)
+    parser.add_argument("--employees", type=int, default=20, help="per manager")
+    parser.add_argument("--days", type=int, default=45)
+    args = parser.parse_args()
+
+    database = seed_database(args.managers, args.employees, args.days)
+    add_edge_cases(database)
+    server, url = start_stub(database)
+    db.SUPABASE_URL = url
+
+    today = date.today()
+    cases = [
+        ("everything", {}),
+        ("manager0, last 30 days", dict(manager_filter="manager0", start_date=today - timedelta(days=29),
+                                        end_date=today)),
+        ("emp1_3, this month", dict(username_filter="emp1_3", start_date=today.replace(day=1), end_date=today)),
+        ("empty range", dict(start_date=today + timedelta(days=10), end_date=today + timedelta(days=20))),
+    ]
+    failures = []
+    print(f"{'case':<26} {'rows':>7} {'python ms':>10} {'KB':>8} {'rpc ms':>8} {'KB':>8}  "
+          f"{'totals py KB':>12} {'rpc KB':>7}  result")
+    for label, filters in cases:
+        py, py_ms, py_kb = timed(database, lambda: load_payroll(**filters, page_size=PAYROLL_PAGE_SIZE,
+                                                                 cached=False, backend="python"))
+        rpc, rpc_ms, rpc_kb = timed(database, lambda: load_payroll(**filters, backend="rpc"))
+        error = compare_frames(label, py, rpc) if not (py.empty and rpc.empty) else None
+        totals_kb = []
+        for status in (None, "approved"):
+            py_totals, _, kb_py = timed(database, lambda: payroll_totals(**filters, status=status,
+                                                                         backend="python"))
+            rpc_totals, _, kb_rpc = timed(database, lambda: payroll_totals(**filters, status=status,
+                                                                           backend="rpc"))
+            error = error or compare_totals(f"{label} ({status or 'all'})", py_totals, rpc_totals)
+            totals_kb.append((kb_py, kb_rpc))
+        if error:
+            failures.append(error)
+        print(f"{label:<26} {len(py):>7,} {py_ms:>10.0f} {py_kb:>8.1f} {rpc_ms:>8.0f} {rpc_kb:>8.1f}  "
+              f"{totals_kb[0][0]:>12.1f} {totals_kb[0][1]:>7.1f}  {'FAIL' if error else 'ok'}")
+    server.shutdown()
+    for failure in failures:
+        print("MISMATCH:", failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,423 @@
+# ==========================================
+# LOCAL POSTGREST STAND-IN
+# ==========================================
+# In-process HTTP server speaking the slice of PostgREST that app.py uses:
+#   GET / HEAD / POST / PATCH / DELETE on /rest/v1/<table>
+#   filters eq, neq, gt, gte, lt, lte, in, like, ilike, is; or=(a.op."v",and(b.op."v",c.op."v"))
+#   select=, order=, limit=, offset=, columns=, Range header
+#   Prefer: count=exact, return=representation
+#   POST /rest/v1/rpc/<name> for functions registered in RPC_FUNCTIONS
+#     (list results page/filter like tables; payroll_rows and payroll_summary
+#     from sql/payroll_rpc.sql are registered below)
+#   POST ?on_conflict=<column> with Prefer: resolution=ignore-duplicates
+# plus counters for requests and bytes so benchmarks can report traffic, and
+# write_delay / fail_writes on StubDatabase to slow down or fail table POSTs.
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+MAX_ROWS = 1000
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+RPC_FUNCTIONS = {}  # name -> fn(database, params) -> JSON-able result
+
+
+class StubDatabase:
+    def __init__(self, tables=None):
+        self.tables = {name: list(rows) for name, rows in (tables or {}).items()}
+        self.next_id = {name: max((r.get("id", 0) for r in rows), default=0) + 1
+                        for name, rows in self.tables.items()}
+        self.lock = threading.Lock()
+        self.write_delay = 0.0  # seconds added to every table POST
+        self.fail_writes = 0  # when set, table POSTs answer with this status and insert nothing
+        self.missing_columns = {}  # table -> columns a select of which fails like an unmigrated schema
+        self.stats = {"requests": 0, "bytes_out": 0, "bytes_in": 0, "by_route": {}}
+
+    def record(self, method, table, bytes_in, bytes_out):
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["bytes_in"] += bytes_in
+            self.stats["bytes_out"] += bytes_out
+            route = f"{method} {table}"
+            self.stats["by_route"][route] = self.stats["by_route"].get(route, 0) + 1
+
+    def snapshot(self):
+        with self.lock:
+            return {"requests": self.stats["requests"], "bytes_out": self.stats["bytes_out"],
+                    "bytes_in": self.stats["bytes_in"], "by_route": dict(self.stats["by_route"])}
+
+    def insert(self, table, rows):
+        with self.lock:
+            rows_out = []
+            for row in rows:
+                row = dict(row)
+                if "id" not in row:
+                    row["id"] = self.next_id.get(table, 1)
+                self.next_id[table] = max(self.next_id.get(table, 1), row["id"] + 1)
+                self.tables.setdefault(table, []).append(row)
+                rows_out.append(row)
+            return rows_out
+
+
+# ==========================================
+# FILTERS
+# ==========================================
+def _coerce(row_value, raw):
+    if isinstance(row_value, bool):
+        return raw == "true"
+    if isinstance(row_value, (int, float)):
+        try:
+            return float(raw)
+        except ValueError:
+            return raw
+    if isinstance(row_value, str) and DATE_RE.match(row_value) and len(row_value) == 10:
+        return raw[:10]  # date column compared with a timestamp literal
+    return raw
+
+
+def _like_regex(pattern):
+    # SQL LIKE as PostgREST sends it: * and % any run, _ one character, a backslash escapes the next
+    out, chars = [], iter(pattern)
+    for ch in chars:
+        if ch == "\\":
+            out.append(re.escape(next(chars, "\\")))
+        else:
+            out.append({"*": ".*", "%": ".*", "_": "."}.get(ch) or re.escape(ch))
+    return "".join(out)
+
+
+def _matches(row, column, expr):
+    negate = expr.startswith("not.")
+    if negate:
+        expr = expr[4:]
+    op, _, raw = expr.partition(".")
+    value = row.get(column)
+    if op == "is":
+        result = value is None if raw == "null" else value == (raw == "true")
+    elif op == "in":
+        options = [v.strip().strip('"') for v in raw.strip("()").split(",") if v.strip()]
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        result = value is not None and str(value) in options
+    elif op in ("like", "ilike"):
+        pattern = re.compile(_like_regex(raw), re.IGNORECASE if op == "ilike" else 0)
+        result = value is not None and pattern.fullmatch(str(value)) is not None
+    else:
+        if value is None:
+            result = False
+        else:
+            other = _coerce(value, raw)
+            if isinstance(other, str) and not isinstance(value, str):
+                value = str(value)
+            result = {
+                "eq": lambda: value == other,
+                "neq": lambda: value != other,
+                "gt": lambda: value > other,
+                "gte": lambda: value >= other,
+                "lt": lambda: value < other,
+                "lte": lambda: value <= other,
+            }.get(op, lambda: False)()
+    return not result if negate else result
+
+
+def _split_terms(raw):
+    # top-level commas of "a.eq.1,and(b.eq.2,c.gt.3)", outside quotes and parentheses
+    terms, depth, quoted, escaped, current = [], 0, False, False, ""
+    for ch in raw:
+        if escaped:
+            escaped = False
+        elif ch == "\\" and quoted:
+            escaped = True
+        elif ch == '"':
+            quoted = not quoted
+        elif not quoted and ch in "()":
+            depth += 1 if ch == "(" else -1
+        elif not quoted and depth == 0 and ch == ",":
+            terms.append(current)
+            current = ""
+            continue
+        current += ch
+    return terms + [current] if current else terms
+
+
+def _matches_term(row, term):
+    for logic, combine in (("and(", all), ("or(", any)):
+        if term.startswith(logic):
+            return combine(_matches_term(row, t) for t in _split_terms(term[len(logic):-1]))
+    column, _, expr = term.partition(".")
+    op, _, value = expr.partition(".")
+    if value.startswith('"') and value.endswith('"'):
+        value = value[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return _matches(row, column, f"{op}.{value}")
+
+
+def _matches_or(row, raw):
+    # raw: "(term,term,...)"; terms may nest and(...) / or(...)
+    return any(_matches_term(row, t) for t in _split_terms(raw.strip()[1:-1]))
+
+
+def _sort_key(value):
+    return (value is None, value if value is not None else 0)
+
+
+def query_rows(rows, params, range_header=None):
+    # returns (selected rows, total matching, offset)
+    filters = [(k, v) for k, v in params if k not in ("select", "order", "limit", "offset",
+                                                        "columns", "on_conflict")]
+    matched = [r for r in rows if all(_matches_or(r, v) if k == "or" else _matches(r, k, v)
+                                      for k, v in filters)]
+    opts = dict(params)
+    if "order" in opts:
+        for part in reversed(opts["order"].split(",")):
+            column, _, direction = part.partition(".")
+            matched.sort(key=lambda r: _sort_key(r.get(column)), reverse=direction.startswith("desc"))
+    total = len(matched)
+    offset = int(opts.get("offset", 0))
+    limit = int(opts["limit"]) if "limit" in opts else None
+    if range_header:
+        start, _, end = range_header.partition("-")
+        offset = int(start)
+        if end:
+            limit = int(end) - offset + 1
+    limit = MAX_ROWS if limit is None else min(limit, MAX_ROWS)
+    page = matched[offset:offset + limit]
+    select = opts.get("select", "*")
+    if select != "*":
+        columns = [c.strip() for c in select.split(",")]
+        page = [{c: r.get(c) for c in columns} for r in page]
+    return page, total, offset
+
+
+# ==========================================
+# HTTP HANDLER
+# ==========================================
+def make_handler(database):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _route(self):
+            parts = urlsplit(self.path)
+            table = parts.path.split("/rest/v1/", 1)[-1]
+            return table, parse_qsl(parts.query, keep_blank_values=True)
+
+        def _body(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            return raw, (json.loads(raw) if raw else None)
+
+        def _send(self, status, payload=None, headers=None, bytes_in=0, table=""):
+            body = b"" if payload is None else json.dumps(payload, default=str).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+            database.record(self.command, table, bytes_in, len(body) if self.command != "HEAD" else 0)
+
+        def _prefer(self):
+            return self.headers.get("Prefer", "")
+
+        def do_GET(self):
+            table, params = self._route()
+            missing = set(dict(params).get("select", "").split(",")) & database.missing_columns.get(table, set())
+            if missing:
+                message = f"column {table}.{min(missing)} does not exist"
+                return self._send(400, {"code": "42703", "message": message}, table=table)
+            with database.lock:
+                rows = list(database.tables.get(table, []))
+            page, total, offset = query_rows(rows, params, self.headers.get("Range"))
+            end = offset + len(page) - 1
+            count = str(total) if "count=exact" in self._prefer() else "*"
+            content_range = f"{offset}-{end}/{count}" if page else f"*/{count}"
+            self._send(200, page, {"Content-Range": content_range}, table=table)
+
+        do_HEAD = do_GET
+
+        def do_POST(self):
+            table, params = self._route()
+            raw, body = self._body()
+            if table.startswith("rpc/"):
+                fn = RPC_FUNCTIONS.get(table[4:])
+                if fn is None:
+                    return self._send(404, {"message": f"function {table[4:]} not found"},
+                                      bytes_in=len(raw), table=table)
+                result = fn(database, body or {})
+                if not isinstance(result, list):
+                    return self._send(200, result, bytes_in=len(raw), table=table)
+                page, total, offset = query_rows(result, params)
+                content_range = f"{offset}-{offset + len(page) - 1}/{total}" if page else f"*/{total}"
+                return self._send(200, page, {"Content-Range": content_range},
+                                  bytes_in=len(raw), table=table)
+            if database.write_delay:
+                time.sleep(database.write_delay)
+            if database.fail_writes:
+                return self._send(database.fail_writes, {"message": "injected failure"},
+                                  bytes_in=len(raw), table=table)
+            rows = body if isinstance(body, list) else [body]
+            conflict = dict(params).get("on_conflict")
+            if conflict and "ignore-duplicates" in self._prefer():
+                with database.lock:
+                    seen = {r.get(conflict) for r in database.tables.get(table, [])}
+                rows = [r for r in rows if r.get(conflict) not in seen]
+            inserted = database.insert(table, rows)
+            if "return=representation" in self._prefer():
+                payload = inserted if isinstance(body, list) else inserted[:1]
+                return self._send(201, payload, bytes_in=len(raw), table=table)
+            self._send(201, bytes_in=len(raw), table=table)
+
+        def do_PATCH(self):
+            table, params = self._route()
+            raw, body = self._body()
+            filters = [(k, v) for k, v in params if k not in ("select", "order", "limit", "offset")]
+            with database.lock:
+                updated = []
+                for row in database.tables.get(table, []):
+                    if all(_matches(row, k, v) for k, v in filters):
+                        row.update(body or {})
+                        updated.append(dict(row))
+            payload = updated if "return=representation" in self._prefer() else None
+            self._send(200 if payload is not None else 204, payload, bytes_in=len(raw), table=table)
+
+        def do_DELETE(self):
+            table, params = self._route()
+            with database.lock:
+                rows = database.tables.get(table, [])
+                keep = [r for r in rows if not all(_matches(r, k, v) for k, v in params)]
+                database.tables[table] = keep
+            self._send(204, table=table)
+
+    return Handler
+
+
+# ==========================================
+# PAYROLL RPC STAND-INS
+# ==========================================
+# Row-at-a-time Python versions of sql/payroll_rpc.sql, written from the SQL
+# rather than from payroll.py so the parity check compares two independent
+# implementations.
+def _payroll_rows(database, params):
+    segment_prices = params.get("p_segment_prices") or {"2": 650, "3": 750, "4": 850}
+    trip_rate = float(params.get("p_trip_rate", 0.16))
+    working_days = float(params.get("p_working_days", 26))
+    with database.lock:
+        wijks = sorted(database.tables.get("wijk", []), key=lambda w: w.get("id", 0))
+        logs = list(database.tables.get("work_logs", []))
+    prices = {}
+    for w in wijks:
+        prices[w["wijk_name"]] = None if w.get("base_price") is None else float(w["base_price"])
+    out = []
+    for log in logs:
+        day = str(log.get("date"))[:10]
+        if params.get("p_username") and log.get("username") != params["p_username"]:
+            continue
+        if params.get("p_manager") and log.get("manager_username") != params["p_manager"]:
+            continue
+        if params.get("p_start") and day < params["p_start"]:
+            continue
+        if params.get("p_end") and day > params["p_end"]:
+            continue
+        if params.get("p_status") and log.get("status") != params["p_status"]:
+            continue
+        segments = float(log.get("segments") or 0)
+        trip_km = float(log.get("trip_km") or 0)
+        if log.get("wijk") in prices:
+            price = prices[log["wijk"]]
+        elif segments.is_integer() and str(int(segments)) in segment_prices:
+            price = float(segment_prices[str(int(segments))])
+        else:
+            price = 500 + 100 * segments
+        trip_cost = trip_km * trip_rate
+        wijk_earn = None if price is None else price / working_days
+        out.append({
+            "id": log["id"], "username": log.get("username"), "date": day, "wijk": log.get("wijk"),
+            "segments": segments, "trip_km": trip_km, "status": log.get("status"),
+            "manager_username": log.get("manager_username"), "wijk_price": price,
+            "trip_cost": trip_cost, "wijk_earn": wijk_earn,
+            "day_earn": None if wijk_earn is None else wijk_earn + trip_cost,
+        })
+    return out
+
+
+def _payroll_summary(database, params):
+    rows = _payroll_rows(database, params)
+
+    def total(column):
+        return sum(r[column] for r in rows if r[column] is not None)
+
+    return [{"log_count": len(rows), "segments": total("segments"), "trip_km": total("trip_km"),
+             "trip_cost": total("trip_cost"), "wijk_earn": total("wijk_earn"),
+             "day_earn": total("day_earn")}]
+
+
+RPC_FUNCTIONS.update(payroll_rows=_payroll_rows, payroll_summary=_payroll_summary)
+
+
+def start_stub(database, host="127.0.0.1", port=0):
+    # returns (server, base_url); call server.shutdown() when done
+    server = ThreadingHTTPServer((host, port), make_handler(database))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+# ==========================================
+# SYNTHETIC DATA
+# ==========================================
+def _sha256(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def seed_database(managers=5, employees_per_manager=40, days=60, wijks=300, seed=7,
+                  end_day=None, password="pass"):
+    rng = random.Random(seed)
+    end_day = end_day or date.today()
+    pw = _sha256(password)
+    employees = [{"id": 1, "firstname": "Ada", "lastname": "Admin", "address": "HQ",
+                  "username": "admin", "password": pw, "role": "admin", "manager_username": None}]
+    for m in range(managers):
+        employees.append({"id": len(employees) + 1, "firstname": f"Manager{m}", "lastname": "Depot",
+                          "address": f"Depotstraat {m}", "username": f"manager{m}", "password": pw,
+                          "role": "manager", "manager_username": None})
+    for m in range(managers):
+        for e in range(employees_per_manager):
+            employees.append({"id": len(employees) + 1, "firstname": f"Carrier{m}_{e}",
+                              "lastname": "Bezorger", "address": f"Straat {e}, Stad {m}",
+                              "username": f"emp{m}_{e}", "password": pw, "role": "employee",
+                              "manager_username": f"manager{m}"})
+    wijk = [{"id": i + 1, "wijk_name": f"W{i:03d}", "depot": f"Depot {i % max(managers, 1)}",
+             "segments": rng.randint(1, 6), "base_price": float(rng.randrange(500, 1200, 25)),
+             "created_by": f"manager{i % max(managers, 1)}"} for i in range(wijks)]
+    logs = []
+    for emp in employees:
+        if emp["role"] != "employee":
+            continue
+        for d in range(days):
+            day = end_day - timedelta(days=d)
+            if day.weekday() == 6:
+                continue
+            for _ in range(rng.choice([1, 1, 1, 2, 3])):
+                known = rng.random() < 0.9
+                name = f"W{rng.randrange(wijks):03d}" if known and wijks else f"X{rng.randrange(100):03d}"
+                status = "pending" if d < 7 else rng.choice(["approved"] * 9 + ["rejected"])
+                logs.append({
+                    "id": len(logs) + 1,
+                    "username": emp["username"], "employee_username": emp["username"],
+                    "manager_username": emp["manager_username"],
+                    "date": day.isoformat(), "wijk": name, "wijk_name": name,
+                    "depot": f"Depot {rng.randrange(max(managers, 1))}",
+                    "trip_km": rng.randint(5, 80), "segments": rng.randint(1, 6),
+                    "status": status, "price_final": None, "earn_final": None,
+                    "notes": "", "created_at": datetime.combine(day, datetime.min.time()).isoformat(),
+                })
+    return StubDatabase({"employees": employees, "wijk": wijk, "work_logs": logs})
@@ -0,0 +1,144 @@
+# ==========================================
+# PAYROLL EXPORT (CSV / PARQUET / XLSX)
+# ==========================================
+# Pages of work_logs are priced and written one at a time, ordered by
+# employee, so memory stays at roughly one page no matter how long the
+# period is. A subtotal row follows each employee and a total row ends the
+# file; the row_type column tells them apart from detail rows.
+import csv
+import time
+
+import numpy as np
+import pandas as pd
+
+from payroll import PAYROLL_PAGE_SIZE, load_payroll_chunks
+
+EXPORT_FORMATS = {"CSV": ".csv", "Parquet": ".parquet", "Excel (XLSX)": ".xlsx"}
+EXPORT_ORDER = "username,date,id"
+TEXT_COLUMNS = ["row_type", "username", "manager_username", "date", "Day", "wijk", "status"]
+SUM_COLUMNS = ["segments", "trip_km", "Wijk Price (€)", "Trip Cost (€)", "Wijk Earn (€)", "Day Earn (€)"]
+EXPORT_COLUMNS = TEXT_COLUMNS + ["rows"] + SUM_COLUMNS
+
+
+def _summary_frame(row_type, users, sums, rows):
+    df = pd.DataFrame(sums, columns=SUM_COLUMNS)
+    df.insert(0, "rows", rows)
+    df.insert(0, "username", users)
+    df.insert(0, "row_type", row_type)
+    return df.reindex(columns=EXPORT_COLUMNS)
+
+
+def with_subtotals(chunks):
+    # chunks must be ordered by username; yields export-shaped frames with a
+    # subtotal row after each employee's last row. The last employee of a
+    # chunk may continue in the next one, so its subtotal is carried over.
+    carry_user, carry_sums, carry_rows = None, None, 0
+    grand_sums, grand_rows = np.zeros(len(SUM_COLUMNS)), 0
+    for df in chunks:
+        if df.empty:
+            continue
+        df = df.assign(row_type="detail", rows=1, date=df["date"].dt.strftime("%Y-%m-%d"))
+        df = df.reindex(columns=EXPORT_COLUMNS).reset_index(drop=True)
+        users = df["username"].to_numpy()
+        last = np.flatnonzero(np.append(users[1:] != users[:-1], True))
+        cum = df[SUM_COLUMNS].to_numpy(dtype=float).cumsum(axis=0)
+        sums = np.diff(np.vstack([np.zeros(len(SUM_COLUMNS)), cum[last]]), axis=0)
+        rows = np.diff(np.append(-1, last))
+        grand_sums += cum[-1]
+        grand_rows += len(df)
+        block_users = users[last]
+        keys = last + 0.5
+        if carry_user is not None:
+            if block_users[0] == carry_user:
+                sums[0] += carry_sums
+                rows[0] += carry_rows
+            else:
+                block_users = np.insert(block_users, 0, carry_user)
+                sums = np.vstack([carry_sums, sums])
+                rows = np.insert(rows, 0, carry_rows)
+                keys = np.insert(keys, 0, -0.5)
+        carry_user, carry_sums, carry_rows = block_users[-1], sums[-1], rows[-1]
+        subtotals = _summary_frame("subtotal", block_users[:-1], sums[:-1], rows[:-1])
+        # empty columns take the detail rows' dtypes, so they do not decide the result's
+        empty = [c for c in EXPORT_COLUMNS if subtotals[c].isna().all()]
+        out = pd.concat([df, subtotals.astype({c: df[c].dtype for c in empty})], ignore_index=True)
+        order = np.argsort(np.concatenate([np.arange(len(df), dtype=float), keys[:-1]]), kind="stable")
+        yield out.iloc[order].reset_index(drop=True)
+    tail = []
+    if carry_user is not None:
+        tail.append(_summary_frame("subtotal", [carry_user], [carry_sums], [carry_rows]))
+    tail.append(_summary_frame("total", [None], [grand_sums], [grand_rows]))
+    yield pd.concat(tail, ignore_index=True)
+
+
+# ==========================================
+# WRITERS
+# ==========================================
+def _write_csv(frames, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerow(EXPORT_COLUMNS)
+        for df in frames:
+            df.to_csv(f, header=False, index=False)
+
+
+def _arrow_schema():
+    import pyarrow as pa
+    return pa.schema([(c, pa.string()) for c in TEXT_COLUMNS] + [("rows", pa.int64())]
+                     + [(c, pa.float64()) for c in SUM_COLUMNS])
+
+
+def _write_parquet(frames, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    schema = _arrow_schema()
+    with pq.ParquetWriter(path, schema) as writer:
+        for df in frames:
+            df = df.astype({c: "float64" for c in SUM_COLUMNS}).astype({"rows": "int64"})
+            df[TEXT_COLUMNS] = df[TEXT_COLUMNS].astype(object).where(df[TEXT_COLUMNS].notna(), None)
+            writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+
+
+def _write_xlsx(frames, path):
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Payroll")
+    ws.append(EXPORT_COLUMNS)
+    for df in frames:
+        df = df.astype(object).where(df.notna(), None)
+        for row in df.itertuples(index=False, name=None):
+            ws.append(row)
+    wb.save(path)
+
+
+WRITERS = {".csv": _write_csv, ".parquet": _write_parquet, ".xlsx": _write_xlsx}
+
+
+def export_frames(chunks, path):
+    # writes priced chunks (ordered by username) to path; format from the extension
+    suffix = path[path.rfind("."):].lower()
+    stats = {"rows": 0, "employees": 0}
+
+    def counted(frames):
+        for df in frames:
+            stats["rows"] += int((df["row_type"] == "detail").sum())
+            stats["employees"] += int((df["row_type"] == "subtotal").sum())
+            yield df
+
+    start = time.perf_counter()
+    WRITERS[suffix](counted(with_subtotals(chunks)), path)
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def export_payroll(path, username_filter=None, manager_filter=None, start_date=None, end_date=None,
+                   page_size=PAYROLL_PAGE_SIZE):
+    chunks = load_payroll_chunks(username_filter, manager_filter, start_date, end_date,
+                                 page_size=page_size, order=EXPORT_ORDER)
+    return export_frames(chunks, path)
+
+
+def frame_chunks(df, page_size=PAYROLL_PAGE_SIZE):
+    # an in-memory frame (e.g. a closed-period snapshot) as export chunks
+    df = df.sort_values(["username", "date"], kind="stable")
+    for start in range(0, len(df), page_size):
+        yield df.iloc[start:start + page_size]
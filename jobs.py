@@ -0,0 +1,294 @@
+# ==========================================
+# BACKGROUND JOBS
+# ==========================================
+# Period closes, exports, totals recomputes and month-end runs are handed to
+# a small thread pool instead of running inside the Streamlit script, so the
+# page stays responsive. Every job is a row in a local SQLite table (status,
+# progress, message, result), which is what the pages poll: a job keeps
+# running across reruns and browser reconnects, and its result can be
+# fetched by whoever submitted it. Jobs that were queued or running when their
+# process stopped are marked "interrupted" by the next process to look.
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+from tracing import bound_context, trace_context
+
+JOBS_PATH = os.environ.get(
+    "DELVERO_JOBS_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "jobs.sqlite"),
+)
+JOBS_DIR = os.environ.get("DELVERO_JOBS_DIR", os.path.join(os.path.dirname(JOBS_PATH), "jobs"))
+JOB_WORKERS = int(os.environ.get("DELVERO_JOB_WORKERS", "2"))
+JOB_PROGRESS_INTERVAL = 0.25  # seconds between progress writes
+ACTIVE_STATUSES = ("queued", "running")
+
+_SCHEMA = """
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, params TEXT NOT NULL,
+    owner TEXT, status TEXT NOT NULL, progress REAL NOT NULL DEFAULT 0, message TEXT,
+    result TEXT, error TEXT, created_at TEXT NOT NULL, started_at TEXT, finished_at TEXT,
+    runner_host TEXT, runner_pid INTEGER
+);
+CREATE INDEX IF NOT EXISTS jobs_owner ON jobs (owner, id);
+"""
+
+JOB_KINDS = {}  # kind -> fn(progress, **params) returning a JSON-able result
+_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="delvero-job")
+_started = False
+_HOST = socket.gethostname()
+
+
+def job_kind(name):
+    def register(fn):
+        JOB_KINDS[name] = fn
+        return fn
+    return register
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _connect():
+    global _started
+    os.makedirs(os.path.dirname(JOBS_PATH), exist_ok=True)
+    conn = sqlite3.connect(JOBS_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    if not _started:
+        conn.executescript(_SCHEMA)
+        if "runner_pid" not in {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}:
+            # a jobs table from before runners were recorded
+            conn.execute("ALTER TABLE jobs ADD COLUMN runner_host TEXT")
+            conn.execute("ALTER TABLE jobs ADD COLUMN runner_pid INTEGER")
+        _started = True
+        _mark_interrupted(conn)
+    return conn
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    return True
+
+
+def _mark_interrupted(conn):
+    # jobs run in the thread pool of the process that submitted them; several
+    # app processes may share this file, so only jobs whose process is gone
+    # are interrupted. Processes on other hosts cannot be checked and are left.
+    dead = [row["id"] for row in conn.execute(
+                "SELECT id, runner_host, runner_pid FROM jobs WHERE status IN (?, ?)", ACTIVE_STATUSES)
+            if row["runner_pid"] is None or (row["runner_host"] == _HOST and not _alive(row["runner_pid"]))]
+    if dead:
+        with conn:
+            conn.executemany("UPDATE jobs SET status = 'interrupted', finished_at = ? "
+                             "WHERE id = ? AND status IN (?, ?)",
+                             [(_now(), job_id, *ACTIVE_STATUSES) for job_id in dead])
+
+
+def _execute(sql, params=()):
+    with _lock:
+        conn = _connect()
+        try:
+            with conn:
+                return conn.execute(sql, params).lastrowid
+        finally:
+            conn.close()
+
+
+def _query(sql, params=()):
+    with _lock:
+        conn = _connect()
+        try:
+            _mark_interrupted(conn)  # a process that died since: its jobs will never finish
+            return [_job(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+
+def _job(row):
+    job = dict(row)
+    job["params"] = json.loads(job["params"])
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+# ==========================================
+# SUBMIT / POLL
+# ==========================================
+def submit_job(kind, params=None, owner=None):
+    # params must be JSON-able (dates are stored as ISO strings); returns the job id
+    if kind not in JOB_KINDS:
+        raise ValueError(f"unknown job kind {kind!r}")
+    params = json.loads(json.dumps(params or {}, default=str))
+    job_id = _execute("INSERT INTO jobs (kind, params, owner, status, created_at, runner_host, runner_pid) "
+                      "VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                      (kind, json.dumps(params), owner, _now(), _HOST, os.getpid()))
+    # spans recorded by the job count for the page and session that submitted it
+    _executor.submit(_run_job, job_id, kind, params, trace_context())
+    return job_id
+
+
+def get_job(job_id):
+    jobs = _query("SELECT * FROM jobs WHERE id = ?", (job_id,))
+    return jobs[0] if jobs else None
+
+
+def list_jobs(owner=None, limit=20):
+    if owner is None:
+        return _query("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,))
+    return _query("SELECT * FROM jobs WHERE owner = ? ORDER BY id DESC LIMIT ?", (owner, limit))
+
+
+def wait_job(job_id, timeout=None, poll=0.1):
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        job = get_job(job_id)
+        if job is None or job["status"] not in ACTIVE_STATUSES:
+            return job
+        if deadline is not None and time.monotonic() > deadline:
+            return job
+        time.sleep(poll)
+
+
+def forget_job(job):
+    # drops a finished job and the file it produced
+    path = (job["result"] or {}).get("path") if isinstance(job["result"], dict) else None
+    if path and os.path.exists(path):
+        os.remove(path)
+    _execute("DELETE FROM jobs WHERE id = ? AND status NOT IN (?, ?)", (job["id"], *ACTIVE_STATUSES))
+
+
+def _run_job(job_id, kind, params, context):
+    _execute("UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?", (_now(), job_id))
+    last = [0.0]
+
+    def progress(fraction, message=None):
+        now = time.monotonic()
+        if now - last[0] < JOB_PROGRESS_INTERVAL and fraction < 1:
+            return
+        last[0] = now
+        _execute("UPDATE jobs SET progress = ?, message = COALESCE(?, message) WHERE id = ?",
+                 (min(max(float(fraction), 0.0), 1.0), message, job_id))
+
+    try:
+        with bound_context({**context, "depth": 0}, []):
+            result = JOB_KINDS[kind](progress, **params)
+    except Exception as e:
+        error = str(e) if isinstance(e, JobError) else f"{e!r}\n\n{traceback.format_exc()}"
+        _execute("UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                 (error, _now(), job_id))
+        return
+    _execute("UPDATE jobs SET status = 'done', progress = 1, result = ?, finished_at = ? WHERE id = ?",
+             (json.dumps(result, default=str), _now(), job_id))
+
+# ==========================================
+# JOB KINDS
+# ==========================================
+# Heavy imports happen inside the jobs so importing this module stays cheap.
+class JobError(Exception):
+    # a job that could not do its work for a reason worth showing as is
+    pass
+
+
+def _day(value):
+    return date.fromisoformat(value[:10]) if value else None
+
+
+@job_kind("close_period")
+def close_period_job(progress, scope, start, end, closed_by):
+    from snapshots import close_period
+    progress(0.1, "Loading payroll")
+    meta, error = close_period(scope, _day(start), _day(end), closed_by)
+    if error:
+        raise JobError(error)
+    return meta
+
+
+@job_kind("export")
+def export_job(progress, scope, ext, username_filter=None, manager_filter=None, start_date=None,
+               end_date=None):
+    from db import db_count
+    from export import EXPORT_ORDER, export_frames, frame_chunks
+    from payroll import load_payroll_chunks, payroll_query
+    from snapshots import find_snapshot, read_snapshot
+
+    start, end = _day(start_date), _day(end_date)
+    snapshot = find_snapshot(scope, start, end) if start and end else None
+    if snapshot:
+        df = read_snapshot(snapshot, username_filter, start, end)
+        chunks, total = frame_chunks(df), len(df)
+    else:
+        total = db_count("work_logs", payroll_query(username_filter, manager_filter, start, end, columns=["id"]))
+        chunks = load_payroll_chunks(username_filter, manager_filter, start, end, order=EXPORT_ORDER)
+
+    def counted(chunks):
+        done = 0
+        for df in chunks:
+            done += len(df)
+            progress(done / total if total else 0, f"{done:,} of {total or 0:,} rows")
+            yield df
+
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    name = f"payroll_{scope}_{start}_{end}{ext}"
+    path = os.path.join(JOBS_DIR, f"{os.getpid()}_{time.time_ns()}_{name}")
+    stats = export_frames(counted(chunks), path)
+    return {**stats, "path": path, "file_name": name}
+
+
+@job_kind("recompute_totals")
+def recompute_totals_job(progress):
+    from payroll import rebuild_totals
+    progress(0.1, "Rebuilding payroll totals")
+    rebuild_totals()
+    return {"rebuilt_at": _now()}
+
+
+@job_kind("payroll_run")
+def payroll_run_job(progress, start, end, manager=None, status=None):
+    # runs the payroll_run.py command: its process pool must not be spawned
+    # from inside the Streamlit server, whose __main__ is the app script
+    import db
+    from payroll_run import RUN_DIR
+    out = os.path.join(RUN_DIR, f"{start}_{end}" + (f"_{manager}" if manager else ""))
+    command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "payroll_run.py"),
+               "--range", start, end, "--out", out, "--progress"]
+    if manager:
+        command += ["--manager", manager]
+    if status:
+        command += ["--status", status]
+    # stderr shares the stdout pipe: reading two pipes one after the other can
+    # deadlock once the child fills the one not being read
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                               env={**os.environ, "DELVERO_SUPABASE_URL": db.SUPABASE_URL,
+                                    "PYTHONUNBUFFERED": "1"})
+    output = deque(maxlen=50)  # the last lines that were not progress, for the error message
+    for line in process.stdout:
+        if line.startswith("progress "):
+            _, fraction, message = line.rstrip("\n").split(" ", 2)
+            progress(float(fraction), message)
+        elif line.strip():
+            output.append(line.rstrip("\n"))
+    process.wait()
+    summary_path = os.path.join(out, "run.json")
+    # exit status 1 only flags logs that belong to no listed employee
+    if process.returncode not in (0, 1) or not os.path.exists(summary_path):
+        raise JobError(output[-1] if output else f"exit status {process.returncode}")
+    with open(summary_path, encoding="utf-8") as f:
+        summary = json.load(f)
+    return {key: summary[key] for key in ("rows", "employees", "paid_employees", "unassigned_rows",
+                                          "rows_per_second", "file")}
@@ -0,0 +1,294 @@
+# ==========================================
+# WORK SUBMISSION OUTBOX
+# ==========================================
+# Submit Work writes new work_logs here first: one SQLite transaction on the
+# app server (WAL, synchronous=FULL), after which the carrier is told the work
+# was received.
+# A background thread sends what is waiting to Supabase in batches. Each row
+# carries a submission_key (sql/work_logs_submission_key.sql) and batches
+# are inserted with on_conflict + ignore-duplicates, so a batch re-sent after
+# a timeout or a crash between insert and delete never lands twice. Failed
+# batches back off and retry; a batch the server rejects as invalid is
+# retried row by row so one bad row cannot hold up the rest, and rows that
+# keep failing are parked as "dead" for an admin to look at. Rows remember
+# the Supabase URL they were queued for and are only sent there.
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+
+import numpy as np
+
+import db
+from db import Query, db_insert_idempotent, db_select
+
+OUTBOX_ENABLED = os.environ.get("DELVERO_OUTBOX", "1") != "0"
+OUTBOX_PATH = os.environ.get(
+    "DELVERO_OUTBOX_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "outbox.sqlite"),
+)
+OUTBOX_TABLE = "work_logs"
+OUTBOX_KEY = "submission_key"
+OUTBOX_BATCH_SIZE = int(os.environ.get("DELVERO_OUTBOX_BATCH", "500"))
+OUTBOX_LINGER = float(os.environ.get("DELVERO_OUTBOX_LINGER", "0.2"))  # wait for more rows to batch
+OUTBOX_IDLE_POLL = 5.0  # longest sleep between flushes, in case another process queued rows
+OUTBOX_BACKOFF = float(os.environ.get("DELVERO_OUTBOX_BACKOFF", "1"))
+OUTBOX_MAX_BACKOFF = 300.0
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get("DELVERO_OUTBOX_MAX_ATTEMPTS", "20"))
+OUTBOX_LATENCY_SAMPLES = 2000
+OUTBOX_SCHEMA_RECHECK = 300.0  # seconds before a missing submission_key column is looked for again
+
+_SCHEMA = """
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS outbox (
+    key TEXT PRIMARY KEY, target TEXT NOT NULL, body TEXT NOT NULL, owner TEXT, created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0, next_attempt REAL NOT NULL, last_error TEXT,
+    dead INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (target, dead, next_attempt);
+"""
+
+_lock = threading.Lock()
+_wake = threading.Event()
+_worker = None
+_schema_ready = False
+_stats = {"enqueued": 0, "flushed": 0, "duplicates": 0, "batches": 0, "failures": 0, "dead": 0}
+_schema_checks = {}  # SUPABASE_URL -> (checked_at, column exists)
+_latency = deque(maxlen=OUTBOX_LATENCY_SAMPLES)  # seconds from enqueue to confirmed insert
+_batch_ms = deque(maxlen=OUTBOX_LATENCY_SAMPLES)
+
+
+def _connect():
+    global _schema_ready
+    os.makedirs(os.path.dirname(OUTBOX_PATH), exist_ok=True)
+    conn = sqlite3.connect(OUTBOX_PATH, timeout=30)
+    conn.execute("PRAGMA synchronous=FULL")  # acknowledged means on disk
+    if not _schema_ready:
+        conn.executescript(_SCHEMA)
+        _schema_ready = True
+    return conn
+
+
+def _ensure_worker():
+    global _worker
+    with _lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name="delvero-outbox", daemon=True)
+            _worker.start()
+
+# ==========================================
+# ENQUEUE
+# ==========================================
+def outbox_ready():
+    # the outbox needs sql/work_logs_submission_key.sql applied: without the
+    # column (and its unique index) every batch would be rejected and parked
+    # as dead after the carrier was told it was received. Callers insert
+    # directly while this is False.
+    if not OUTBOX_ENABLED:
+        return False
+    with _lock:
+        checked = _schema_checks.get(db.SUPABASE_URL)
+    if checked and (checked[1] or time.monotonic() - checked[0] < OUTBOX_SCHEMA_RECHECK):
+        return checked[1]
+    try:
+        rows = db_select(OUTBOX_TABLE, Query(OUTBOX_KEY).limit(1), session=False)
+    except Exception:
+        return False  # unreachable: not an answer about the schema, ask again next time
+    if isinstance(rows, list):
+        exists = True
+    elif isinstance(rows, dict) and rows.get("code"):
+        exists = False  # e.g. 42703 column does not exist
+    else:
+        return False
+    with _lock:
+        _schema_checks[db.SUPABASE_URL] = (time.monotonic(), exists)
+    return exists
+
+
+def enqueue(rows, owner=None):
+    # durably queues rows for work_logs; returns their submission keys
+    now = time.time()
+    rows = [{**row, OUTBOX_KEY: str(uuid.uuid4())} for row in rows]
+    with _lock:
+        conn = _connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO outbox (key, target, body, owner, created_at, next_attempt) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(row[OUTBOX_KEY], db.SUPABASE_URL, json.dumps(row, default=str), owner, now, now)
+                     for row in rows],
+                )
+        finally:
+            conn.close()
+        _stats["enqueued"] += len(rows)
+    _ensure_worker()
+    _wake.set()
+    return [row[OUTBOX_KEY] for row in rows]
+
+# ==========================================
+# FLUSH
+# ==========================================
+def _due(conn, limit):
+    # only rows queued for the Supabase project this process talks to
+    return conn.execute(
+        "SELECT key, body, created_at, attempts FROM outbox "
+        "WHERE target = ? AND dead = 0 AND next_attempt <= ? ORDER BY created_at LIMIT ?",
+        (db.SUPABASE_URL, time.time(), limit),
+    ).fetchall()
+
+
+def _send(batch):
+    # batch: [(key, body, created_at, attempts)] -> [(entry, error or None)]
+    start = time.perf_counter()
+    status, result = db_insert_idempotent(OUTBOX_TABLE, [json.loads(body) for _, body, _, _ in batch],
+                                          OUTBOX_KEY)
+    _batch_ms.append((time.perf_counter() - start) * 1000)
+    if status is not None and status < 300:
+        _stats["duplicates"] += len(batch) - len(result)
+        return [(entry, None) for entry in batch]
+    _stats["failures"] += 1
+    error = f"{status or 'no response'}: {str(result)[:500]}"
+    if len(batch) > 1 and status is not None and 400 <= status < 500 and status not in (408, 429):
+        # the server rejected something in the batch: find out which rows, one by one
+        return [outcome for entry in batch for outcome in _send([entry])]
+    return [(entry, error) for entry in batch]
+
+
+def flush_outbox(limit=None):
+    # sends every row that is due, a batch at a time; returns rows confirmed
+    confirmed = 0
+    while True:
+        with _lock:
+            conn = _connect()
+            try:
+                batch = _due(conn, min(limit - confirmed, OUTBOX_BATCH_SIZE) if limit else OUTBOX_BATCH_SIZE)
+            finally:
+                conn.close()
+        if not batch:
+            return confirmed
+        outcomes = _send(batch)
+        now = time.time()
+        sent = [entry for entry, error in outcomes if error is None]
+        failed = [(entry, error) for entry, error in outcomes if error is not None]
+        with _lock:
+            conn = _connect()
+            try:
+                with conn:
+                    conn.executemany("DELETE FROM outbox WHERE key = ?", [(key,) for key, *_ in sent])
+                    for (key, _, _, attempts), error in failed:
+                        dead = attempts + 1 >= OUTBOX_MAX_ATTEMPTS
+                        backoff = min(OUTBOX_BACKOFF * 2 ** attempts, OUTBOX_MAX_BACKOFF)
+                        conn.execute("UPDATE outbox SET attempts = attempts + 1, next_attempt = ?, "
+                                     "last_error = ?, dead = ? WHERE key = ?",
+                                     (now + backoff, error, int(dead), key))
+                        _stats["dead"] += dead
+            finally:
+                conn.close()
+            _stats["flushed"] += len(sent)
+            _stats["batches"] += 1
+            _latency.extend(now - created_at for _, _, created_at, _ in sent)
+        confirmed += len(sent)
+        if failed or (limit and confirmed >= limit):
+            return confirmed  # the rest waits for its backoff
+
+
+def _seconds_to_next_attempt():
+    with _lock:
+        conn = _connect()
+        try:
+            (next_attempt,) = conn.execute("SELECT MIN(next_attempt) FROM outbox WHERE target = ? AND dead = 0",
+                                           (db.SUPABASE_URL,)).fetchone()
+        finally:
+            conn.close()
+    if next_attempt is None:
+        return OUTBOX_IDLE_POLL
+    return min(max(next_attempt - time.time(), 0.0), OUTBOX_IDLE_POLL)
+
+
+def _run():
+    wait = 0.0  # rows left by an earlier process go out straight away
+    while True:
+        _wake.wait(wait)
+        if _wake.is_set():
+            time.sleep(OUTBOX_LINGER)  # let submissions arriving together share a batch
+            _wake.clear()
+        try:
+            flush_outbox()
+            wait = _seconds_to_next_attempt()
+        except Exception:
+            wait = OUTBOX_BACKOFF  # e.g. the SQLite file is locked; try again
+
+
+def wait_outbox(timeout=30.0, poll=0.05):
+    # blocks until nothing is waiting to be sent (dead rows aside); True when drained
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if outbox_stats()["depth"] == 0:
+            return True
+        _wake.set()
+        time.sleep(poll)
+    return False
+
+# ==========================================
+# METRICS & ADMIN
+# ==========================================
+def _percentile(samples, q):
+    return float(np.percentile(list(samples), q)) if samples else None
+
+
+def outbox_stats(owner=None):
+    with _lock:
+        conn = _connect()
+        try:
+            where, params = "AND target = ?", [db.SUPABASE_URL]
+            if owner is not None:
+                where, params = where + " AND owner = ?", params + [owner]
+            depth, oldest = conn.execute(
+                f"SELECT COUNT(*), MIN(created_at) FROM outbox WHERE dead = 0 {where}", params).fetchone()
+            dead = conn.execute(f"SELECT COUNT(*) FROM outbox WHERE dead = 1 {where}", params).fetchone()[0]
+        finally:
+            conn.close()
+        stats = dict(_stats)
+        latency, batch_ms = list(_latency), list(_batch_ms)
+    return {
+        **stats, "depth": depth, "dead_rows": dead,
+        "oldest_age_s": time.time() - oldest if oldest else 0.0,
+        "flush_latency_p50_s": _percentile(latency, 50), "flush_latency_p95_s": _percentile(latency, 95),
+        "batch_p50_ms": _percentile(batch_ms, 50), "batch_p95_ms": _percentile(batch_ms, 95),
+    }
+
+
+def dead_rows():
+    with _lock:
+        conn = _connect()
+        try:
+            return [{"key": key, "owner": owner, "attempts": attempts, "last_error": error, **json.loads(body)}
+                    for key, owner, attempts, error, body in conn.execute(
+                        "SELECT key, owner, attempts, last_error, body FROM outbox WHERE target = ? AND dead = 1 "
+                        "ORDER BY created_at", (db.SUPABASE_URL,))]
+        finally:
+            conn.close()
+
+
+def retry_dead():
+    # gives parked rows another round of attempts, e.g. after fixing the cause
+    with _lock:
+        conn = _connect()
+        try:
+            with conn:
+                count = conn.execute("UPDATE outbox SET dead = 0, attempts = 0, next_attempt = ? "
+                                     "WHERE target = ? AND dead = 1", (time.time(), db.SUPABASE_URL)).rowcount
+        finally:
+            conn.close()
+    _ensure_worker()
+    _wake.set()
+    return count
+
+
+# rows left behind by a previous process start flushing as soon as this is imported
+if OUTBOX_ENABLED:
+    _ensure_worker()
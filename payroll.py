@@ -0,0 +1,418 @@
+# ==========================================
+# PAYROLL — LOADING & PRICING
+# ==========================================
+# Imported by app.py (ZONE 16) and by the scripts in benchmarks/.
+import calendar
+import os
+import threading
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from db import Query, db_rpc, db_rpc_pages, db_select_many, db_select_pages, on_write
+from tracing import traced
+from wijk_index import WIJK_COLUMNS, wijk_index
+from worklog_cache import WORKLOG_CACHE_ENABLED, cached_logs
+
+PAYROLL_COLUMNS = ["username", "date", "wijk", "segments", "trip_km", "status", "manager_username"]
+SEGMENT_PRICES = {2: 650, 3: 750, 4: 850}
+TRIP_RATE_PER_KM = 0.16
+WORKING_DAYS = 26
+PAYROLL_PAGE_SIZE = 1000
+# repeating strings become categoricals, whole-number counts small ints;
+# money columns stay float64 so earnings are bit-for-bit unchanged
+CATEGORY_COLUMNS = ["username", "wijk", "status", "manager_username", "Day"]
+INTEGER_COLUMNS = ["segments", "trip_km"]
+PRICED_COLUMNS = ["Wijk Price (€)", "Trip Cost (€)", "Wijk Earn (€)", "Day Earn (€)"]
+# "python" prices rows here; "rpc" lets Postgres do it (sql/payroll_rpc.sql)
+PAYROLL_BACKEND = os.environ.get("DELVERO_PAYROLL_BACKEND", "python")
+
+# ==========================================
+# PRICING ENGINE
+# ==========================================
+def compute_price(wijk_name, segments, wijk_price_map):
+    # scalar reference rule; price_rows must agree with it row for row
+    if wijk_name in wijk_price_map:
+        return wijk_price_map[wijk_name]
+    if segments in SEGMENT_PRICES:
+        return SEGMENT_PRICES[segments]
+    return 500 + 100 * segments
+
+def price_rows(wijk, segments, wijk_price_map):
+    # a known wijk always wins, even when its base_price is empty
+    known = wijk.isin(list(wijk_price_map)).to_numpy()
+    mapped = wijk.map(wijk_price_map).to_numpy(dtype=float, na_value=np.nan)
+    seg = segments.to_numpy(dtype=float)
+    fallback = np.select(
+        [seg == s for s in SEGMENT_PRICES],
+        list(SEGMENT_PRICES.values()),
+        default=500 + 100 * seg,
+    )
+    return pd.Series(np.where(known, mapped, fallback), index=wijk.index)
+
+def price_frame(df, wijk_price_map):
+    df["Wijk Price (€)"] = price_rows(df["wijk"], df["segments"], wijk_price_map)
+    df["Trip Cost (€)"] = df["trip_km"] * TRIP_RATE_PER_KM
+    df["Wijk Earn (€)"] = df["Wijk Price (€)"] / WORKING_DAYS
+    df["Day Earn (€)"] = df["Wijk Earn (€)"] + df["Trip Cost (€)"]
+    return df
+
+def frame_totals(df):
+    # same keys as payroll_totals, summed from an already priced frame
+    if df.empty:
+        return dict.fromkeys(TOTALS_FIELDS, 0.0)
+    totals = {c: float(df[c].sum()) for c in TOTALS_FIELDS[1:]}
+    return {"rows": float(len(df)), **totals}
+
+def chunk_totals(chunks, status=None):
+    # frame_totals over priced chunks, holding one chunk at a time
+    out = dict.fromkeys(TOTALS_FIELDS, 0.0)
+    for df in chunks:
+        if status:
+            df = df[df["status"] == status]
+        for field, value in frame_totals(df).items():
+            out[field] += value
+    return out
+
+# ==========================================
+# LOAD PAYROLL DATA
+# ==========================================
+def payroll_query(username_filter=None, manager_filter=None, start_date=None, end_date=None,
+                  columns=PAYROLL_COLUMNS):
+    query = Query(*columns)
+    if username_filter:
+        query.eq("username", username_filter)
+    if manager_filter:
+        query.eq("manager_username", manager_filter)
+    if start_date:
+        query.gte("date", start_date)
+    if end_date:
+        query.lte("date", end_date)
+    return query
+
+def logs_frame(logs):
+    if isinstance(logs, pd.DataFrame):
+        if logs.empty:
+            return pd.DataFrame()
+        df = logs
+    else:
+        if not logs or logs == [{}]:
+            return pd.DataFrame()
+        if isinstance(logs, dict):
+            logs = [logs]
+        logs = [x for x in logs if isinstance(x, dict) and x]
+        if not logs:
+            return pd.DataFrame()
+        df = pd.DataFrame(logs)
+    for c in PAYROLL_COLUMNS:
+        if c not in df.columns:
+            df[c] = None
+    df["date"] = pd.to_datetime(df["date"])
+    df["Day"] = df["date"].dt.day_name()
+    df["segments"] = pd.to_numeric(df["segments"], errors="coerce").fillna(0)
+    df["trip_km"] = pd.to_numeric(df["trip_km"], errors="coerce").fillna(0)
+    return df
+
+def load_payroll_chunks(username_filter=None, manager_filter=None, start_date=None, end_date=None,
+                        page_size=PAYROLL_PAGE_SIZE, wijk_price_map=None, order="id"):
+    # priced DataFrame per page of work_logs
+    if wijk_price_map is None:
+        wijk_price_map = wijk_index().price_map
+    query = payroll_query(username_filter, manager_filter, start_date, end_date)
+    for rows in db_select_pages("work_logs", query, page_size=page_size, order=order):
+        df = logs_frame(rows)
+        if not df.empty:
+            yield price_frame(df, wijk_price_map)
+
+def compact_frame(df):
+    for c in CATEGORY_COLUMNS:
+        df[c] = df[c].astype("category")
+    for c in INTEGER_COLUMNS:
+        if (df[c] % 1 == 0).all():
+            df[c] = pd.to_numeric(df[c], downcast="integer")
+    return df
+
+def concat_compact(frames):
+    # align categories first so the concatenated columns stay categorical
+    for c in CATEGORY_COLUMNS:
+        categories = frames[0][c].cat.categories
+        for f in frames[1:]:
+            categories = categories.union(f[c].cat.categories)
+        for f in frames:
+            f[c] = f[c].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
+
+def memory_per_row(df):
+    return df.memory_usage(deep=True).sum() / len(df) if len(df) else 0.0
+
+@traced("load_payroll", table="work_logs")
+def load_payroll(username_filter=None, manager_filter=None, start_date=None, end_date=None,
+                 page_size=None, cached=True, backend=None):
+    if (backend or PAYROLL_BACKEND) == "rpc":
+        return load_payroll_rpc(username_filter, manager_filter, start_date, end_date,
+                                page_size=page_size or PAYROLL_PAGE_SIZE)
+    if cached and WORKLOG_CACHE_ENABLED and start_date and end_date:
+        # bounded ranges come from the local day-partitioned copy (worklog_cache.py)
+        df = logs_frame(cached_logs(username_filter, manager_filter, start_date, end_date))
+        if df.empty:
+            return df
+        return compact_frame(price_frame(df, wijk_index().price_map))
+    if page_size:
+        # one page of JSON at a time, but the result is still the whole range;
+        # callers that only need totals or a file consume load_payroll_chunks
+        chunks = [compact_frame(df) for df in load_payroll_chunks(
+            username_filter, manager_filter, start_date, end_date, page_size=page_size)]
+        if not chunks:
+            return pd.DataFrame()
+        return concat_compact(chunks)
+    data = db_select_many({
+        "logs": ("work_logs", payroll_query(username_filter, manager_filter, start_date, end_date)),
+        "wijk_table": ("wijk", Query(*WIJK_COLUMNS)),
+    })
+    df = logs_frame(data["logs"])
+    if df.empty:
+        return df
+    return compact_frame(price_frame(df, wijk_index(data["wijk_table"] or []).price_map))
+
+# ==========================================
+# SERVER-SIDE PRICING (POSTGREST RPC)
+# ==========================================
+# payroll_rows / payroll_summary from sql/payroll_rpc.sql price and sum in
+# Postgres, so only priced rows or a single totals row cross the wire. The
+# constants above are sent along so both backends price identically.
+RPC_READS = ("work_logs", "wijk")
+RPC_PRICED_COLUMNS = dict(zip(["wijk_price", "trip_cost", "wijk_earn", "day_earn"], PRICED_COLUMNS))
+RPC_TOTALS_COLUMNS = dict(zip(["log_count", "segments", "trip_km", "trip_cost", "wijk_earn", "day_earn"],
+                              ["rows", "segments", "trip_km", "Trip Cost (€)", "Wijk Earn (€)", "Day Earn (€)"]))
+
+
+def rpc_params(username_filter=None, manager_filter=None, start_date=None, end_date=None, status=None):
+    return {
+        "p_username": username_filter,
+        "p_manager": manager_filter,
+        "p_start": str(pd.Timestamp(start_date).date()) if start_date else None,
+        "p_end": str(pd.Timestamp(end_date).date()) if end_date else None,
+        "p_status": status,
+        "p_segment_prices": {str(k): v for k, v in SEGMENT_PRICES.items()},
+        "p_trip_rate": TRIP_RATE_PER_KM,
+        "p_working_days": WORKING_DAYS,
+    }
+
+
+def load_payroll_rpc(username_filter=None, manager_filter=None, start_date=None, end_date=None,
+                     page_size=PAYROLL_PAGE_SIZE):
+    params = rpc_params(username_filter, manager_filter, start_date, end_date)
+    columns = PAYROLL_COLUMNS + ["Day"] + PRICED_COLUMNS
+    chunks = []
+    query = Query(*PAYROLL_COLUMNS, *RPC_PRICED_COLUMNS)
+    for rows in db_rpc_pages("payroll_rows", params, query, page_size=page_size):
+        df = logs_frame(rows)
+        if not df.empty:
+            chunks.append(compact_frame(df.rename(columns=RPC_PRICED_COLUMNS).reindex(columns=columns)))
+    if not chunks:
+        return pd.DataFrame()
+    return concat_compact(chunks)
+
+
+def payroll_totals_rpc(username_filter=None, manager_filter=None, start_date=None, end_date=None,
+                       status=None):
+    rows = db_rpc("payroll_summary", rpc_params(username_filter, manager_filter, start_date, end_date, status),
+                  reads=RPC_READS)
+    if not isinstance(rows, list) or not rows:
+        return dict.fromkeys(TOTALS_FIELDS, 0.0)
+    return {field: float(rows[0].get(column) or 0) for column, field in RPC_TOTALS_COLUMNS.items()}
+
+# ==========================================
+# INCREMENTAL TOTALS (PER EMPLOYEE / DAY / PAY PERIOD)
+# ==========================================
+# Totals are kept per (manager, employee, status) for every day and every
+# calendar month of the last TOTALS_WINDOW_DAYS; ranges starting earlier are
+# summed from the logs themselves. Each refresh only downloads logs above the
+# id watermark; status changes made through db_update are applied from the
+# PATCH response. Writes we cannot replay (deletes, wijk price changes) and
+# the periodic refresh rebuild everything, which also picks up edits made by
+# other processes. Downloads happen outside _totals_lock, which is only held
+# to read the totals or swap in new ones.
+TOTALS_FIELDS = ["rows", "segments", "trip_km", "Trip Cost (€)", "Wijk Earn (€)", "Day Earn (€)"]
+TOTALS_FULL_REFRESH_SECONDS = float(os.environ.get("DELVERO_TOTALS_REFRESH", "900"))
+TOTALS_WINDOW_DAYS = int(os.environ.get("DELVERO_TOTALS_WINDOW_DAYS", "400"))
+
+_refresh_lock = threading.Lock()  # one refresh downloads at a time
+_totals_lock = threading.RLock()
+_totals = {}
+_patches = None  # while a refresh downloads: PATCHed rows to apply again after it, None for a reset
+
+
+def _empty_totals():
+    return dict(built_at=None, since=None, max_id=0, logs={}, daily={}, periods={}, price_map=None)
+
+
+def _reset_totals():
+    with _totals_lock:
+        _totals.clear()
+        _totals.update(_empty_totals())
+        if _patches is not None:
+            _patches.append(None)  # what is being downloaded is already out of date
+
+
+_reset_totals()
+
+
+def _add_totals(bucket, key, sub, vals, sign):
+    acc = bucket.setdefault(key, {}).setdefault(sub, [0.0] * len(TOTALS_FIELDS))
+    for i, v in enumerate(vals):
+        acc[i] += sign * v
+
+
+def _move_log(state, entry, sign):
+    key, day, vals = entry
+    _add_totals(state["daily"], key, day, vals, sign)
+    _add_totals(state["periods"], key, (day.year, day.month), vals, sign)
+
+
+def _apply_priced(df, state=None):
+    # replaces any earlier contribution of the same log id
+    state = _totals if state is None else state
+    columns = zip(
+        df["id"], df["manager_username"], df["username"], df["status"], df["date"].dt.date,
+        df["segments"], df["trip_km"], df["Trip Cost (€)"], df["Wijk Earn (€)"], df["Day Earn (€)"],
+    )
+    for log_id, manager, user, status, day, *amounts in columns:
+        old = state["logs"].pop(log_id, None)
+        if old is not None:
+            _move_log(state, old, -1)
+        # a known wijk without base_price prices as NaN; skip it like a frame sum would
+        entry = ((manager, user, status), day, (1.0, *[0.0 if a != a else float(a) for a in amounts]))
+        state["logs"][log_id] = entry
+        _move_log(state, entry, +1)
+        state["max_id"] = max(state["max_id"], int(log_id))
+
+
+def _apply_patch(rows):
+    # under _totals_lock: status changes of logs already counted
+    if _totals["price_map"] is None:
+        return
+    if rows is None:
+        _reset_totals()
+        return
+    known = [r for r in rows if r.get("id") in _totals["logs"]]
+    if any(c not in r for r in known for c in PAYROLL_COLUMNS):
+        _reset_totals()
+        return
+    df = logs_frame(known)
+    if not df.empty:
+        _apply_priced(price_frame(df, _totals["price_map"]))
+
+
+def refresh_totals(wait=True):
+    # wait=False: when another refresh is already downloading and there are
+    # totals to show, go on with those instead of queueing behind it
+    global _patches
+    if not _refresh_lock.acquire(blocking=wait or _totals["built_at"] is None):
+        return
+    try:
+        while True:
+            with _totals_lock:
+                built_at = _totals["built_at"]
+                full = built_at is None or time.monotonic() - built_at > TOTALS_FULL_REFRESH_SECONDS
+                max_id = 0 if full else _totals["max_id"]
+                since = date.today() - timedelta(days=TOTALS_WINDOW_DAYS) if full else _totals["since"]
+                price_map = None if full else _totals["price_map"]
+                _patches = []
+            if full:
+                # a rebuild fills a new state nobody reads yet; a delta is applied at the end
+                state = dict(_empty_totals(), since=since, price_map=wijk_index().price_map)
+                price_map = state["price_map"]
+            frames = []
+            query = Query("id", *PAYROLL_COLUMNS).gt("id", max_id).gte("date", since)
+            for rows in db_select_pages("work_logs", query):
+                df = logs_frame(rows)
+                if df.empty:
+                    continue
+                if full:
+                    _apply_priced(price_frame(df, price_map), state)
+                else:
+                    frames.append(price_frame(df, price_map))
+            with _totals_lock:
+                patches, _patches = _patches, None
+                if None in patches:
+                    continue  # reset while downloading: start again from scratch
+                if full:
+                    _totals.clear()
+                    _totals.update(state, built_at=time.monotonic())
+                for df in frames:
+                    _apply_priced(df)
+                for rows in patches:
+                    _apply_patch(rows)
+                return
+    except Exception:
+        with _totals_lock:
+            _patches = None
+        _reset_totals()
+        raise
+    finally:
+        _refresh_lock.release()
+
+
+def rebuild_totals():
+    # full rebuild on demand (the admin "Recompute totals" job)
+    with _refresh_lock:
+        _reset_totals()
+    refresh_totals()
+
+
+def payroll_totals(username_filter=None, manager_filter=None, start_date=None, end_date=None,
+                   status=None, backend=None):
+    if (backend or PAYROLL_BACKEND) == "rpc":
+        return payroll_totals_rpc(username_filter, manager_filter, start_date, end_date, status)
+    refresh_totals(wait=False)
+    start = pd.Timestamp(start_date).date() if start_date else date.min
+    end = pd.Timestamp(end_date).date() if end_date else date.max
+    since = _totals["since"]
+    if since is None or start < since:
+        # before the window kept in memory (or reset meanwhile): sum the logs of the range page by page
+        return chunk_totals(load_payroll_chunks(username_filter, manager_filter, start_date, end_date), status)
+    out = [0.0] * len(TOTALS_FIELDS)
+
+    def add(vals):
+        for i, v in enumerate(vals):
+            out[i] += v
+
+    with _totals_lock:
+        for key, months in _totals["periods"].items():
+            manager, user, log_status = key
+            if username_filter and user != username_filter:
+                continue
+            if manager_filter and manager != manager_filter:
+                continue
+            if status and log_status != status:
+                continue
+            partial = set()
+            for (year, month), vals in months.items():
+                first = date(year, month, 1)
+                last = date(year, month, calendar.monthrange(year, month)[1])
+                if start <= first and last <= end:
+                    add(vals)
+                elif first <= end and start <= last:
+                    partial.add((year, month))
+            if partial:
+                for day, vals in _totals["daily"][key].items():
+                    if (day.year, day.month) in partial and start <= day <= end:
+                        add(vals)
+    return dict(zip(TOTALS_FIELDS, out))
+
+
+@on_write
+def _totals_on_write(table, method, rows):
+    if table == "wijk" or (table == "work_logs" and method == "DELETE"):
+        _reset_totals()
+        return
+    if table != "work_logs" or method != "PATCH":
+        return
+    # inserts are picked up by the id watermark on the next refresh
+    with _totals_lock:
+        if _patches is not None:
+            _patches.append(rows)  # the refresh under way may have read these rows before the change
+        _apply_patch(rows)
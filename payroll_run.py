@@ -0,0 +1,194 @@
+# ==========================================
+# MONTH-END PAYROLL RUN (HEADLESS)
+# ==========================================
+# python payroll_run.py --month 2026-09 [--manager manager0] [--status approved]
+#                       [--workers 4] [--out payroll_runs] [--format .csv]
+#
+# Computes every carrier's line items and totals for one period at once.
+# The wijk price table is read once by the parent and handed to each worker
+# process; employees are split into contiguous batches (by username) that the
+# pool works through, each batch fetched with one paged `username=in.(...)`
+# query and priced with the same rules as load_payroll. Workers write one
+# payslip per employee; the parent writes the consolidated file (detail,
+# subtotal per employee, total, as in export.py) and run.json with the
+# totals, throughput and per-worker timings.
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+
+import db
+from db import Query, db_count, db_select, db_select_pages
+from export import EXPORT_ORDER, export_frames, frame_chunks
+from payroll import (PAYROLL_PAGE_SIZE, compact_frame, concat_compact, frame_totals, logs_frame,
+                     payroll_query, price_frame, wijk_index)
+
+RUN_DIR = os.environ.get("DELVERO_PAYROLL_RUN_DIR",
+                         os.path.join(os.path.dirname(os.path.abspath(__file__)), "payroll_runs"))
+RUN_BATCH_SIZE = int(os.environ.get("DELVERO_PAYROLL_RUN_BATCH", "50"))  # usernames per query
+
+_worker = {}  # per worker process: the price map and run settings from _init_worker
+
+
+def month_range(month):
+    year, mon = (int(x) for x in month.split("-"))
+    start = date(year, mon, 1)
+    end = date(year + mon // 12, mon % 12 + 1, 1)
+    return start, date.fromordinal(end.toordinal() - 1)
+
+
+def run_employees(manager=None):
+    query = Query("username", "manager_username").eq("role", "employee").order("username")
+    if manager:
+        query.eq("manager_username", manager)
+    return [e["username"] for e in db_select("employees", query) or []]
+
+
+def partition(usernames, size=RUN_BATCH_SIZE):
+    return [usernames[i:i + size] for i in range(0, len(usernames), size)]
+
+# ==========================================
+# WORKER SIDE
+# ==========================================
+def _init_worker(supabase_url, wijk_price_map, settings):
+    # spawned processes re-import db, so the parent's URL override travels too
+    db.SUPABASE_URL = supabase_url
+    _worker.update(settings, price_map=wijk_price_map)
+
+
+def _run_batch(usernames):
+    timings = {"pid": os.getpid(), "fetch": 0.0, "price": 0.0, "write": 0.0}
+    start, end, status = _worker["start"], _worker["end"], _worker["status"]
+    query = payroll_query(start_date=start, end_date=end).in_("username", usernames)
+    if status:
+        query.eq("status", status)
+    frames = []
+    clock = time.perf_counter()
+    for rows in db_select_pages("work_logs", query, page_size=PAYROLL_PAGE_SIZE, order=EXPORT_ORDER):
+        now = time.perf_counter()
+        timings["fetch"] += now - clock
+        df = logs_frame(rows)
+        if not df.empty:
+            frames.append(compact_frame(price_frame(df, _worker["price_map"])))
+        clock = time.perf_counter()
+        timings["price"] += clock - now
+    df = concat_compact(frames) if frames else logs_frame([])
+
+    clock = time.perf_counter()
+    payslips = os.path.join(_worker["out"], "payslips")
+    for username, slip in (df.groupby("username", observed=True, sort=False) if frames else []):
+        export_frames(frame_chunks(slip), os.path.join(payslips, f"{username}{_worker['format']}"))
+    timings["write"] = time.perf_counter() - clock
+    timings.update(employees=len(usernames), rows=len(df))
+    return df, timings
+
+# ==========================================
+# PARENT SIDE
+# ==========================================
+def payroll_run(start, end, out, manager=None, status=None, workers=None, fmt=".csv", progress=None):
+    # progress(fraction, message), if given, is called as batches complete (see jobs.py)
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(os.path.join(out, "payslips"), exist_ok=True)
+    price_map = wijk_index().price_map  # the only wijk read of the run
+    usernames = run_employees(manager)
+    batches = partition(usernames)
+    settings = {"start": start, "end": end, "status": status, "out": out, "format": fmt}
+
+    frames, per_worker = [], {}
+    # spawn, not fork: the parent already holds pooled HTTP connections
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(batches) or 1), mp_context=context,
+                             initializer=_init_worker,
+                             initargs=(db.SUPABASE_URL, price_map, settings)) as pool:
+        futures = [pool.submit(_run_batch, batch) for batch in batches]
+        for future in as_completed(futures):
+            df, timings = future.result()
+            if not df.empty:
+                frames.append(df)
+            worker = per_worker.setdefault(timings.pop("pid"), dict.fromkeys(
+                ["batches", "employees", "rows", "fetch", "price", "write"], 0))
+            worker["batches"] += 1
+            for key, value in timings.items():
+                worker[key] += value
+            if progress:
+                done = sum(w["batches"] for w in per_worker.values())
+                progress(done / len(batches), f"{done} of {len(batches)} batches")
+    computed = time.perf_counter()
+
+    df = concat_compact(frames) if frames else logs_frame([])
+    path = os.path.join(out, f"payroll_{start}_{end}{fmt}")
+    export_frames(frame_chunks(df) if frames else iter([]), path)
+    finished = time.perf_counter()
+
+    count_query = payroll_query(start_date=start, end_date=end, manager_filter=manager, columns=["id"])
+    if status:
+        count_query.eq("status", status)
+    expected = db_count("work_logs", count_query)
+    seconds = finished - started
+    summary = {
+        "start": str(start), "end": str(end), "manager": manager, "status": status,
+        "employees": len(usernames), "paid_employees": int(df["username"].nunique()) if frames else 0,
+        "rows": len(df), "unassigned_rows": None if expected is None else expected - len(df),
+        "totals": frame_totals(df),
+        "file": path, "workers": workers, "batches": len(batches),
+        "seconds": {"total": seconds, "compute": computed - started, "consolidate": finished - computed},
+        "rows_per_second": len(df) / seconds if seconds else 0.0,
+        "employees_per_second": len(usernames) / seconds if seconds else 0.0,
+        "per_worker": [{"pid": pid, **w} for pid, w in sorted(per_worker.items())],
+    }
+    with open(os.path.join(out, "run.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, default=str)
+    return summary
+
+
+def print_summary(summary):
+    print(f"{summary['start']} .. {summary['end']}: {summary['rows']:,} rows, "
+          f"{summary['paid_employees']}/{summary['employees']} employees paid, "
+          f"{summary['totals']['Day Earn (€)']:,.2f} € earned")
+    print(f"{summary['seconds']['total']:.2f} s with {summary['workers']} worker(s) over "
+          f"{summary['batches']} batches: {summary['rows_per_second']:,.0f} rows/s, "
+          f"{summary['employees_per_second']:,.1f} employees/s "
+          f"(consolidate {summary['seconds']['consolidate']:.2f} s)")
+    if summary["unassigned_rows"]:
+        print(f"⚠ {summary['unassigned_rows']} log(s) in the period belong to no listed employee")
+    print(f"\n{'pid':>8} {'batches':>8} {'employees':>10} {'rows':>8} {'fetch s':>8} {'price s':>8} "
+          f"{'write s':>8}")
+    for w in summary["per_worker"]:
+        print(f"{w['pid']:>8} {w['batches']:>8} {w['employees']:>10} {w['rows']:>8,} {w['fetch']:>8.2f} "
+              f"{w['price']:>8.2f} {w['write']:>8.2f}")
+    print(f"\nconsolidated: {summary['file']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Month-end payroll run")
+    period = parser.add_mutually_exclusive_group(required=True)
+    period.add_argument("--month", help="YYYY-MM")
+    period.add_argument("--range", nargs=2, metavar=("START", "END"), help="YYYY-MM-DD YYYY-MM-DD")
+    parser.add_argument("--manager")
+    parser.add_argument("--status", help="e.g. approved (default: every status, as on the Payroll page)")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--out", help=f"default: {RUN_DIR}/<start>_<end>")
+    parser.add_argument("--format", default=".csv", choices=[".csv", ".parquet", ".xlsx"])
+    parser.add_argument("--progress", action="store_true", help="print 'progress <fraction> <message>' lines")
+    args = parser.parse_args(argv)
+
+    if args.month:
+        start, end = month_range(args.month)
+    else:
+        start, end = (date.fromisoformat(d) for d in args.range)
+    out = args.out or os.path.join(RUN_DIR, f"{start}_{end}")
+    report = (lambda fraction, message: print(f"progress {fraction:.4f} {message}", flush=True)
+              ) if args.progress else None
+    summary = payroll_run(start, end, out, manager=args.manager, status=args.status,
+                          workers=args.workers, fmt=args.format, progress=report)
+    print_summary(summary)
+    return 0 if not summary["unassigned_rows"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
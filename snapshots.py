@@ -0,0 +1,139 @@
+# ==========================================
+# CLOSED PAY PERIOD SNAPSHOTS
+# ==========================================
+# Closing a period freezes load_payroll output for one scope (a manager, or
+# "_all" for the admin view) and a date range into a Parquet file plus a JSON
+# sidecar. Reads that fall inside a closed period are served from the file;
+# everything else is computed live.
+import json
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from payroll import PAYROLL_PAGE_SIZE, load_payroll
+
+SNAPSHOT_DIR = os.environ.get(
+    "DELVERO_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots"),
+)
+ALL_SCOPE = "_all"
+
+_close_lock = threading.Lock()  # close jobs run side by side in jobs.py's pool
+
+
+def _day(value):
+    return pd.Timestamp(value).date()
+
+
+def _base(scope, start, end):
+    return os.path.join(SNAPSHOT_DIR, f"{scope}__{_day(start)}__{_day(end)}")
+
+
+def list_snapshots(scope=None):
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return []
+    metas = []
+    for name in sorted(os.listdir(SNAPSHOT_DIR)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(SNAPSHOT_DIR, name)) as f:
+            meta = json.load(f)
+        if scope is None or meta["scope"] == scope:
+            metas.append(meta)
+    return metas
+
+
+def find_snapshot(scope, start, end):
+    # a closed period of this scope that contains [start, end]
+    for meta in list_snapshots(scope):
+        if _day(meta["start"]) <= _day(start) and _day(end) <= _day(meta["end"]):
+            return meta
+    return None
+
+
+def overlapping_snapshot(scope, start, end):
+    # a closed period of this scope sharing at least one day with [start, end]
+    for meta in list_snapshots(scope):
+        if _day(meta["start"]) <= _day(end) and _day(start) <= _day(meta["end"]):
+            return meta
+    return None
+
+
+def close_period(scope, start, end, closed_by):
+    # returns (meta, None) or (None, error message)
+    with _close_lock:
+        return _close_period(scope, start, end, closed_by)
+
+
+def _close_period(scope, start, end, closed_by):
+    if find_snapshot(scope, start, end):
+        return None, "This period is already closed."
+    # a day in two snapshots would have two sets of frozen totals
+    other = overlapping_snapshot(scope, start, end)
+    if other:
+        return None, (f"This period overlaps the closed period {other['start']} → {other['end']}; "
+                      "reopen that one first or pick dates outside it.")
+    df = load_payroll(manager_filter=None if scope == ALL_SCOPE else scope,
+                      start_date=start, end_date=end, page_size=PAYROLL_PAGE_SIZE, cached=False)
+    if df.empty:
+        return None, "No work logs in this period."
+    pending = int((df["status"] == "pending").sum())
+    if pending:
+        return None, f"{pending} log(s) are still pending approval."
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    base = _base(scope, start, end)
+    df.to_parquet(base + ".parquet.tmp", index=False)
+    os.replace(base + ".parquet.tmp", base + ".parquet")
+    meta = {
+        "scope": scope,
+        "start": str(_day(start)),
+        "end": str(_day(end)),
+        "rows": len(df),
+        "closed_by": closed_by,
+        "closed_at": datetime.now().isoformat(timespec="seconds"),
+        "file": os.path.basename(base) + ".parquet",
+    }
+    with open(base + ".json.tmp", "w") as f:
+        json.dump(meta, f)
+    os.replace(base + ".json.tmp", base + ".json")
+    return meta, None
+
+
+def reopen_period(meta):
+    base = _base(meta["scope"], meta["start"], meta["end"])
+    for ext in (".json", ".parquet"):
+        if os.path.exists(base + ext):
+            os.remove(base + ext)
+
+
+def read_snapshot(meta, username_filter=None, start=None, end=None):
+    df = pd.read_parquet(os.path.join(SNAPSHOT_DIR, meta["file"]))
+    if username_filter:
+        df = df[df["username"] == username_filter]
+    if start:
+        df = df[df["date"] >= pd.Timestamp(_day(start))]
+    if end:
+        df = df[df["date"] <= pd.Timestamp(_day(end))]
+    return df.reset_index(drop=True)
+
+
+def load_period(username_filter=None, manager_filter=None, start_date=None, end_date=None,
+                scope=None, page_size=PAYROLL_PAGE_SIZE):
+    # (DataFrame, snapshot meta or None); closed periods never touch the database.
+    # Without a scope (employee view) any closed period holding the employee's
+    # rows is used.
+    if start_date and end_date:
+        if scope:
+            candidates = [m for m in [find_snapshot(scope, start_date, end_date)] if m]
+        else:
+            candidates = [m for m in list_snapshots()
+                          if _day(m["start"]) <= _day(start_date) and _day(end_date) <= _day(m["end"])]
+        for meta in candidates:
+            df = read_snapshot(meta, username_filter, start_date, end_date)
+            if scope or not df.empty:
+                return df, meta
+    df = load_payroll(username_filter=username_filter, manager_filter=manager_filter,
+                      start_date=start_date, end_date=end_date, page_size=page_size)
+    return df, None
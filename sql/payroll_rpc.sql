@@ -0,0 +1,111 @@
+-- ==========================================
+-- PAYROLL RPC — SERVER-SIDE PRICING & TOTALS
+-- ==========================================
+-- Used by payroll.py when DELVERO_PAYROLL_BACKEND=rpc:
+--   POST /rest/v1/rpc/payroll_rows     priced work_logs rows (page with limit/offset/order)
+--   POST /rest/v1/rpc/payroll_summary  one row of totals for the same filters
+-- Pricing follows payroll.price_rows: a known wijk's base_price always wins,
+-- even when it is empty; otherwise the segment price, otherwise
+-- 500 + 100 * segments. The segment prices, km rate and working days are
+-- passed in by payroll.py so both backends use one set of constants.
+-- Arithmetic is done in double precision, like pandas.
+--
+-- Apply with psql (or the Supabase SQL editor), then: NOTIFY pgrst, 'reload schema';
+
+create or replace function payroll_rows(
+    p_username text default null,
+    p_manager text default null,
+    p_start date default null,
+    p_end date default null,
+    p_status text default null,
+    p_segment_prices jsonb default '{"2": 650, "3": 750, "4": 850}',
+    p_trip_rate double precision default 0.16,
+    p_working_days double precision default 26
+)
+returns table (
+    id bigint,
+    username text,
+    date date,
+    wijk text,
+    segments double precision,
+    trip_km double precision,
+    status text,
+    manager_username text,
+    wijk_price double precision,
+    trip_cost double precision,
+    wijk_earn double precision,
+    day_earn double precision
+)
+language sql stable
+as $$
+    with prices as (
+        -- one price per name; the newest row wins, like the dict built in Python
+        select distinct on (wijk_name) wijk_name, base_price::double precision as base_price
+        from wijk
+        order by wijk_name, id desc
+    ),
+    logs as (
+        select l.id, l.username, l.date::date as date, l.wijk,
+               coalesce(l.segments, 0)::double precision as segments,
+               coalesce(l.trip_km, 0)::double precision as trip_km,
+               l.status, l.manager_username,
+               p.wijk_name is not null as known_wijk, p.base_price
+        from work_logs l
+        left join prices p on p.wijk_name = l.wijk
+        where (p_username is null or l.username = p_username)
+          and (p_manager is null or l.manager_username = p_manager)
+          and (p_start is null or l.date >= p_start)
+          and (p_end is null or l.date <= p_end)
+          and (p_status is null or l.status = p_status)
+    ),
+    priced as (
+        select logs.*,
+               case
+                   when known_wijk then base_price
+                   when segments = trunc(segments)
+                        and p_segment_prices ? (segments::bigint)::text
+                       then (p_segment_prices ->> (segments::bigint)::text)::double precision
+                   else 500 + 100 * segments
+               end as wijk_price
+        from logs
+    )
+    select id, username, date, wijk, segments, trip_km, status, manager_username,
+           wijk_price,
+           trip_km * p_trip_rate,
+           wijk_price / p_working_days,
+           wijk_price / p_working_days + trip_km * p_trip_rate
+    from priced
+$$;
+
+create or replace function payroll_summary(
+    p_username text default null,
+    p_manager text default null,
+    p_start date default null,
+    p_end date default null,
+    p_status text default null,
+    p_segment_prices jsonb default '{"2": 650, "3": 750, "4": 850}',
+    p_trip_rate double precision default 0.16,
+    p_working_days double precision default 26
+)
+returns table (
+    log_count bigint,
+    segments double precision,
+    trip_km double precision,
+    trip_cost double precision,
+    wijk_earn double precision,
+    day_earn double precision
+)
+language sql stable
+as $$
+    select count(*),
+           coalesce(sum(r.segments), 0),
+           coalesce(sum(r.trip_km), 0),
+           coalesce(sum(r.trip_cost), 0),
+           coalesce(sum(r.wijk_earn), 0),
+           coalesce(sum(r.day_earn), 0)
+    from payroll_rows(p_username, p_manager, p_start, p_end, p_status,
+                      p_segment_prices, p_trip_rate, p_working_days) r
+$$;
+
+grant execute on function payroll_rows(text, text, date, date, text, jsonb, double precision, double precision) to anon;
+grant execute on function payroll_summary(text, text, date, date, text, jsonb, double precision, double precision) to anon;
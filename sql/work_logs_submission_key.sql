@@ -0,0 +1,13 @@
+-- ==========================================
+-- WORK_LOGS — IDEMPOTENT SUBMISSIONS
+-- ==========================================
+-- Rows sent from the local outbox (outbox.py) carry a client-generated
+-- submission_key. The unique index lets PostgREST insert them with
+-- on_conflict=submission_key and resolution=ignore-duplicates, so a batch
+-- re-sent after a timeout or lost response never creates duplicate logs.
+-- Rows written before this column existed keep NULL, which is allowed any
+-- number of times.
+
+alter table work_logs add column if not exists submission_key uuid;
+
+create unique index if not exists work_logs_submission_key on work_logs (submission_key);
@@ -0,0 +1,170 @@
+# ==========================================
+# REQUEST TRACING & PAGE TIMINGS
+# ==========================================
+# Every db_* helper and load_payroll runs inside a span that records its
+# duration, the HTTP requests made on its behalf (worst status code, bytes
+# received, error body), the number of rows returned, and the session, page
+# (menu entry) and rerun it belongs to. Spans are kept in a bounded
+# in-memory buffer for the admin "Performance" page and, when
+# DELVERO_TRACE_LOG is set, appended to that file as JSON lines.
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+TRACE_LOG_PATH = os.environ.get("DELVERO_TRACE_LOG", "")
+TRACE_MAX_SPANS = int(os.environ.get("DELVERO_TRACE_MAX_SPANS", "20000"))
+TRACE_ERROR_CHARS = 500
+
+_lock = threading.Lock()
+_spans = deque(maxlen=TRACE_MAX_SPANS)
+_local = threading.local()  # .stack of open spans; .context and .parents bound in workers
+
+
+def set_page(page):
+    # called once per rerun; spans recorded afterwards belong to this page and run
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return
+    state = ctx.session_state
+    state["_trace_page"] = page
+    state["_trace_run"] = (state["_trace_run"] if "_trace_run" in state else 0) + 1
+
+
+def trace_context():
+    # who the current thread is working for; db_parallel hands this to its workers
+    bound = getattr(_local, "context", None)
+    depth = len(_stack())
+    if bound is not None:
+        return {**bound, "depth": bound["depth"] + depth}
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return {"session": None, "page": None, "run": None, "depth": depth}
+    state = ctx.session_state
+    return {
+        "session": ctx.session_id,
+        "page": state["_trace_page"] if "_trace_page" in state else None,
+        "run": state["_trace_run"] if "_trace_run" in state else None,
+        "depth": depth,
+    }
+
+
+def open_spans():
+    # spans open on this thread, including those of the caller when in a worker
+    return _stack() + getattr(_local, "parents", [])
+
+
+@contextmanager
+def bound_context(context, parents):
+    # worker side of db_parallel: record as the caller and charge its open spans
+    _local.context, _local.parents = context, parents
+    try:
+        yield
+    finally:
+        _local.context, _local.parents = None, []
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def note_http(status, nbytes, error=None):
+    # called by db._request; charged to every enclosing span
+    with _lock:  # parent spans are shared with db_parallel workers
+        for record in open_spans():
+            record["requests"] += 1
+            record["bytes"] += nbytes
+            record["status"] = max(record["status"] or 0, status)
+            if error and not record["error"]:
+                record["error"] = error[:TRACE_ERROR_CHARS]
+
+
+def _emit(record):
+    with _lock:
+        _spans.append(record)
+        if TRACE_LOG_PATH:
+            with open(TRACE_LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+
+
+@contextmanager
+def span(op, table=None):
+    record = {"op": op, "table": table, "status": None, "requests": 0, "bytes": 0,
+              "rows": None, "error": None, **trace_context()}
+    stack = _stack()
+    stack.append(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    except Exception as e:
+        record["error"] = record["error"] or repr(e)[:TRACE_ERROR_CHARS]
+        raise
+    finally:
+        record["ms"] = (time.perf_counter() - start) * 1000
+        record["ts"] = time.time()
+        stack.remove(record)  # generators may close out of order
+        _emit(record)
+
+
+def _row_count(result):
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, int) and not isinstance(result, bool):
+        return result
+    if hasattr(result, "shape"):
+        return len(result)
+    return None
+
+
+def traced(op, table=None):
+    # table defaults to the first positional argument (the db_* convention);
+    # generator functions are timed until they are exhausted or closed
+    def wrap(fn):
+        def table_of(args):
+            if table is not None:
+                return table
+            return args[0] if args and isinstance(args[0], str) else None
+
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def gen(*args, **kwargs):
+                with span(op, table_of(args)) as record:
+                    record["rows"] = 0
+                    for item in fn(*args, **kwargs):
+                        record["rows"] += _row_count(item) or 0
+                        yield item
+            return gen
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with span(op, table_of(args)) as record:
+                result = fn(*args, **kwargs)
+                record["rows"] = _row_count(result)
+                return result
+        return inner
+    return wrap
+
+
+def trace_spans(session=None):
+    with _lock:
+        spans = list(_spans)
+    if session is not None:
+        spans = [s for s in spans if s["session"] == session]
+    return spans
+
+
+def clear_spans():
+    with _lock:
+        _spans.clear()
+
+
+def spans_jsonl(spans):
+    return "".join(json.dumps(s, default=str) + "\n" for s in spans)
@@ -0,0 +1,37 @@
+# ==========================================
+# PAGE MODULES
+# ==========================================
+# app.py draws the login screen and sidebar, then hands the selected menu
+# entry to render_page. Each page lives in its own module here and is
+# imported the first time it is shown, so the login screen and pages like
+# Profile never load pandas or the payroll/export stack. (Not named pages/:
+# Streamlit would turn that directory into its own multipage navigation.)
+import importlib
+
+PAGES = {
+    ("admin", "📊 Admin Dashboard"): "admin_dashboard",
+    ("admin", "➕ Add Manager"): "add_manager",
+    ("admin", "📋 Managers"): "managers",
+    ("admin", "🧑‍💼 Add Employee"): "add_employee",
+    ("admin", "👥 Employees"): "employees",
+    ("admin", "🗂 Wijk Management"): "wijk_management",
+    ("admin", "📊 Payroll"): "payroll_dashboard",
+    ("admin", "⏱ Performance"): "performance",
+    ("manager", "📊 Manager Dashboard"): "manager_dashboard",
+    ("manager", "🧑‍💼 Add Employee"): "add_employee",
+    ("manager", "👥 Employees"): "employees",
+    ("manager", "🗂 Wijk Management"): "wijk_management",
+    ("manager", "📝 Approvals"): "approvals",
+    ("manager", "📥 Import Logs"): "import_logs",
+    ("manager", "📊 Payroll"): "payroll_dashboard",
+    ("employee", "📝 Submit Work"): "submit_work",
+    ("employee", "💰 My Earnings"): "my_earnings",
+}
+
+
+def render_page(role, menu, username):
+    # menu entries without a module (e.g. Settings, Profile) render nothing yet
+    name = PAGES.get((role, menu))
+    if name is None:
+        return
+    importlib.import_module(f"views.{name}").render(username, role)
@@ -0,0 +1,45 @@
+# ==========================================
+# ZONE 12 — ADD EMPLOYEE (ADMIN & MANAGER)
+# ==========================================
+import streamlit as st
+
+from auth import hash_password
+from db import Query, db_insert, db_select
+
+
+def render(username, role):
+    st.title("🧑‍💼 Add New Employee")
+
+    # --------------- Manager selection ---------------
+    if role == "admin":
+        managers = db_select("employees", Query("username").eq("role", "manager")) or []
+        manager_usernames = [m["username"] for m in managers]
+        selected_manager = st.selectbox("Assign Employee To Manager", manager_usernames)
+    else:
+        selected_manager = username  # manager assigns to themselves
+
+    # --------------- Employee Form ---------------
+    with st.form("form_add_employee"):
+        fn = st.text_input("First Name")
+        ln = st.text_input("Last Name")
+        addr = st.text_input("Address")
+        uname = st.text_input("Username")
+        pw = st.text_input("Password", type="password")
+        submit = st.form_submit_button("Create Employee")
+
+    if submit:
+        if not fn or not ln or not uname or not pw:
+            st.error("❌ Required fields missing.")
+        else:
+            hashed = hash_password(pw)
+            db_insert("employees", {
+                "firstname": fn,
+                "lastname": ln,
+                "address": addr,
+                "username": uname,
+                "password": hashed,
+                "role": "employee",
+                "manager_username": selected_manager
+            })
+            st.success(f"Employee '{uname}' created under manager '{selected_manager}'.")
+            st.stop()
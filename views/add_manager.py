@@ -0,0 +1,59 @@
+# ==========================================
+# ZONE 10 — ADD MANAGER (ADMIN) — FINAL NON-RERUN VERSION
+# ==========================================
+import pandas as pd
+import streamlit as st
+
+from auth import hash_password
+from db import Query, db_insert, db_select
+
+
+def render(username, role):
+    st.title("➕ Add New Manager")
+
+    if "manager_created" not in st.session_state:
+        st.session_state.manager_created = False
+
+    if st.session_state.manager_created:
+        st.success("Manager created successfully!")
+        st.header("📋 Managers")
+
+        managers = db_select("employees", Query("firstname", "lastname", "username").eq("role", "manager"))
+
+        if managers:
+            df = pd.DataFrame(managers)[["firstname", "lastname", "username"]]
+            st.dataframe(df, use_container_width=True, hide_index=True)
+        else:
+            st.info("No managers found.")
+        st.stop()
+
+    with st.form("form_add_manager"):
+        fn = st.text_input("First Name")
+        ln = st.text_input("Last Name")
+        addr = st.text_input("Address")
+        uname = st.text_input("Username")
+        pw = st.text_input("Password", type="password")
+        submit = st.form_submit_button("Create Manager")
+
+    if submit:
+        if not fn or not ln or not uname or not pw:
+            st.error("❌ All fields are required.")
+            st.stop()
+
+        hashed = hash_password(pw)
+        result = db_insert("employees", {
+            "firstname": fn,
+            "lastname": ln,
+            "address": addr,
+            "username": uname,
+            "password": hashed,
+            "role": "manager"
+        })
+
+        if result is None:
+            st.error("❌ Failed to create manager.")
+            st.stop()
+
+        st.session_state.manager_created = True
+        st.success(f"Manager '{uname}' created successfully!")
+        st.stop()
@@ -0,0 +1,44 @@
+# ==========================================
+# ZONE 8 — ADMIN DASHBOARD
+# ==========================================
+from datetime import date, timedelta
+
+import streamlit as st
+
+from db import Query, db_count_many
+from jobs import submit_job
+from views.jobs_panel import jobs_panel
+
+
+def render(username, role):
+    st.title("📊 Admin Dashboard")
+
+    counts = db_count_many({
+        "managers": ("employees", Query().eq("role", "manager")),
+        "employees": ("employees", Query().eq("role", "employee")),
+        "wijks": ("wijk", Query()),
+        "pending_logs": ("work_logs", Query().eq("status", "pending")),
+    })
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Managers", counts["managers"] or 0)
+    col2.metric("Employees", counts["employees"] or 0)
+    col3.metric("Wijks", counts["wijks"] or 0)
+    col4.metric("Pending Approvals", counts["pending_logs"] or 0)
+
+    st.markdown("### System Overview")
+    st.info("A full analytics dashboard will be added in version 1.2.0.")
+
+    st.markdown("### 🧵 Background Jobs")
+    last_month_end = date.today().replace(day=1) - timedelta(days=1)
+    col1, col2 = st.columns(2)
+    run_start = col1.date_input("Run Start", last_month_end.replace(day=1))
+    run_end = col2.date_input("Run End", last_month_end)
+    col1, col2 = st.columns(2)
+    if col1.button("🗓 Month-End Payroll Run"):
+        job_id = submit_job("payroll_run", dict(start=run_start, end=run_end), owner=username)
+        st.success(f"Payroll run {run_start} → {run_end} started (job #{job_id}).")
+    if col2.button("🔄 Recompute Totals"):
+        job_id = submit_job("recompute_totals", owner=username)
+        st.success(f"Recomputing payroll totals (job #{job_id}).")
+    jobs_panel(limit=15)
@@ -0,0 +1,60 @@
+# ==========================================
+# ZONE 17 — MANAGER APPROVALS
+# ==========================================
+import time
+
+import pandas as pd
+import streamlit as st
+
+from db import Query, db_select, db_update
+
+
+def update_log_status(query, status):
+    start = time.perf_counter()
+    updated = db_update("work_logs", query, {"status": status})
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if updated is None:
+        return
+    st.session_state.approval_result = (
+        f"{len(updated)} log(s) {status} in one request — {elapsed_ms:.0f} ms"
+    )
+    st.rerun()
+
+
+def render(username, role):
+    st.title("📝 Approvals — Pending Work Logs")
+    if st.session_state.get("approval_result"):
+        st.success(st.session_state.pop("approval_result"))
+    pending = db_select("work_logs", Query("id", "username", "date", "wijk", "trip_km", "segments")
+                        .eq("manager_username", username).eq("status", "pending")) or []
+    if not pending:
+        st.info("No pending approvals.")
+        st.stop()
+    df = pd.DataFrame(pending)[["username", "date", "wijk", "trip_km", "segments"]]
+    st.dataframe(df, use_container_width=True, hide_index=True)
+    st.markdown("---")
+    st.subheader("Select logs to approve:")
+    options = {f"#{p['id']} — {p['username']} — {p['date']} — {p['wijk']}": p["id"] for p in pending}
+    selected = st.multiselect("Pending Logs", list(options))
+    col1, col2 = st.columns(2)
+    approve_btn = col1.button("✅ Approve selected", disabled=not selected)
+    reject_btn = col2.button("❌ Reject selected", disabled=not selected)
+    ids_query = Query().in_("id", [options[label] for label in selected])
+    if approve_btn:
+        update_log_status(ids_query, "approved")
+    if reject_btn:
+        update_log_status(ids_query, "rejected")
+
+    st.markdown("---")
+    st.subheader("Approve all for employee / date range:")
+    emp_names = sorted({p["username"] for p in pending})
+    dates = sorted(p["date"] for p in pending)
+    emp_choice = st.selectbox("Employee", ["All"] + emp_names)
+    range_start = st.date_input("From", pd.to_datetime(dates[0]).date())
+    range_end = st.date_input("To", pd.to_datetime(dates[-1]).date())
+    range_query = (Query().eq("manager_username", username).eq("status", "pending")
+                   .gte("date", range_start).lte("date", range_end))
+    if emp_choice != "All":
+        range_query.eq("username", emp_choice)
+    if st.button("✅ Approve all in range"):
+        update_log_status(range_query, "approved")
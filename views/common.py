@@ -0,0 +1,26 @@
+# ==========================================
+# SHARED PAGE HELPERS
+# ==========================================
+from datetime import datetime
+
+
+def work_log_row(employee_username, manager_username, work_date, wijk_name, depot, trip_km, notes):
+    return {
+        "employee_username": employee_username,
+        "manager_username": manager_username,
+        "date": str(work_date),
+        "wijk_name": wijk_name,
+        "depot": depot,
+        "trip_km": trip_km,
+        "segments": None,
+        "status": "pending",
+        "price_final": None,
+        "earn_final": None,
+        "notes": notes,
+        "created_at": datetime.now().isoformat()
+    }
+
+
+def as_number(value):
+    # totals are float sums; show whole numbers without ".0"
+    return int(value) if float(value).is_integer() else round(value, 2)
@@ -0,0 +1,35 @@
+# ==========================================
+# ZONE 13 — EMPLOYEE LIST (ADMIN + MANAGER)
+# ==========================================
+import streamlit as st
+
+from db import Query, db_delete
+from views.paged_table import query_table
+
+EMPLOYEE_COLUMNS = ["firstname", "lastname", "username", "manager_username"]
+
+
+def render(username, role):
+    st.title("👥 Employee List")
+
+    emp_query = Query(*EMPLOYEE_COLUMNS).eq("role", "employee")
+    if role == "manager":
+        emp_query.eq("manager_username", username)
+    # only the page on screen is fetched; search, sort and paging run in the query
+    employees = query_table("employees", "employees", emp_query, EMPLOYEE_COLUMNS,
+                            ["firstname", "lastname", "username"], "lastname")
+
+    if not employees:
+        st.info("No employees found.")
+    else:
+        st.markdown("---")
+        st.subheader("🗑 Delete Employee")
+
+        usernames = [e["username"] for e in employees]
+        selected = st.selectbox("Select Employee", usernames)
+        delete_btn = st.button("Delete Employee")
+
+        if delete_btn:
+            db_delete("employees", Query().eq("username", selected))
+            st.success(f"Employee '{selected}' deleted.")
+            st.stop()
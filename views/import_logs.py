@@ -0,0 +1,80 @@
+# ==========================================
+# ZONE 15B — MANAGER: IMPORT WORK LOGS (CSV / EXCEL)
+# ==========================================
+import pandas as pd
+import streamlit as st
+
+from db import Query, db_insert_many, db_select
+from wijk_index import wijk_index
+from views.common import work_log_row
+
+IMPORT_COLUMNS = ["employee_username", "date", "wijk_name", "depot", "trip_km", "notes"]
+
+
+def render(username, role):
+    st.title("📥 Import Work Logs")
+    st.caption("Columns: " + ", ".join(IMPORT_COLUMNS) + " — depot and notes are optional.")
+
+    upload = st.file_uploader("CSV or Excel file", type=["csv", "xlsx"])
+    if upload is None:
+        st.stop()
+
+    try:
+        if upload.name.lower().endswith(".xlsx"):
+            raw = pd.read_excel(upload, dtype=str)
+        else:
+            raw = pd.read_csv(upload, dtype=str)
+    except ImportError:
+        st.error("❌ Excel import needs the 'openpyxl' package; upload a CSV instead.")
+        st.stop()
+    except ValueError as e:
+        st.error(f"❌ Could not read file: {e}")
+        st.stop()
+
+    raw.columns = [c.strip().lower() for c in raw.columns]
+    missing = [c for c in ["employee_username", "date", "wijk_name", "trip_km"] if c not in raw.columns]
+    if missing:
+        st.error("❌ Missing columns: " + ", ".join(missing))
+        st.stop()
+    raw = raw.reindex(columns=IMPORT_COLUMNS).fillna("")
+
+    team_query = Query("username").eq("role", "employee").eq("manager_username", username)
+    team = {e["username"] for e in db_select("employees", team_query) or []}
+    index = wijk_index()
+
+    rows, results = [], []
+    for rec in raw.to_dict("records"):
+        emp_name = rec["employee_username"].strip()
+        wijk_name = rec["wijk_name"].strip()
+        matched = index.resolve(wijk_name)
+        work_date = pd.to_datetime(rec["date"], errors="coerce")
+        trip_km = pd.to_numeric(rec["trip_km"], errors="coerce")
+        if emp_name not in team:
+            results.append("❌ not in your team")
+        elif pd.isna(work_date):
+            results.append("❌ invalid date")
+        elif not wijk_name:
+            results.append("❌ wijk missing")
+        elif pd.isna(trip_km) or trip_km < 0:
+            results.append("❌ invalid trip_km")
+        else:
+            results.append("✅ ready")
+            # known wijks are stored under their own spelling, with their depot
+            rows.append(work_log_row(emp_name, username, work_date.date(),
+                                     matched["wijk_name"] if matched else wijk_name,
+                                     matched["depot"] if matched else rec["depot"].strip(),
+                                     float(trip_km), rec["notes"]))
+
+    raw["Result"] = results
+    st.dataframe(raw, use_container_width=True, hide_index=True)
+
+    if len(rows) < len(raw):
+        st.warning(f"⚠ {len(raw) - len(rows)} row(s) have errors; fix the file to import them.")
+
+    if rows and st.button(f"Import {len(rows)} log(s)"):
+        inserted = db_insert_many("work_logs", rows)
+        if inserted is None:
+            st.error("❌ Import failed, nothing was saved.")
+        else:
+            st.success(f"✅ Imported {len(inserted)} work log(s) in one request.")
+        st.stop()
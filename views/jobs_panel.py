@@ -0,0 +1,87 @@
+# ==========================================
+# BACKGROUND JOBS PANEL (PAYROLL & ADMIN)
+# ==========================================
+import os
+
+import streamlit as st
+
+from jobs import ACTIVE_STATUSES, forget_job, list_jobs
+
+JOB_POLL_SECONDS = 2
+JOB_LABELS = {
+    "close_period": "🔒 Close Period",
+    "export": "⬇ Export",
+    "recompute_totals": "🔄 Recompute Totals",
+    "payroll_run": "🗓 Month-End Payroll Run",
+}
+STATUS_ICONS = {"queued": "⏳", "running": "⚙", "done": "✅", "failed": "❌", "interrupted": "⚠"}
+
+
+def _jobs(owner, kinds, limit):
+    return [j for j in list_jobs(owner, limit) if kinds is None or j["kind"] in kinds]
+
+
+def _result_line(job):
+    result = job["result"] or {}
+    if job["kind"] == "close_period":
+        return f"Period {result['start']} → {result['end']} closed ({result['rows']:,} rows)."
+    if job["kind"] == "export":
+        return f"{result['rows']:,} rows, {result['employees']} employees, written in {result['seconds']:.1f} s"
+    if job["kind"] == "payroll_run":
+        return (f"{result['rows']:,} rows, {result['paid_employees']}/{result['employees']} employees paid, "
+                f"{result['rows_per_second']:,.0f} rows/s")
+    return f"Finished {job['finished_at']}"
+
+
+def _download(job, path, file_name):
+    # exports can be hundreds of MB: the file is read only after the user asks
+    # for it, not on every rerun and poll of the panel
+    key = f"job_download_{job['id']}"
+    ready = f"{key}_ready"
+    if not st.session_state.get(ready):
+        size = os.path.getsize(path)
+        label = f"{size / 1e6:,.1f} MB" if size >= 1e6 else f"{max(size / 1e3, 1):,.0f} KB"
+        st.button(f"📦 Prepare download ({label})", key=f"{key}_prepare",
+                  on_click=st.session_state.__setitem__, args=(ready, True))
+        return
+    with open(path, "rb") as f:
+        st.download_button("Download", data=f.read(), key=key, file_name=file_name,
+                           on_click=st.session_state.__setitem__, args=(ready, False))
+
+
+def _job_list(owner, kinds, limit, polling):
+    jobs = _jobs(owner, kinds, limit)
+    if polling and not any(j["status"] in ACTIVE_STATUSES for j in jobs):
+        st.rerun()  # the last job finished: redraw the whole page with its result
+    if not jobs:
+        st.caption("No background jobs yet.")
+        return
+    for job in jobs:
+        with st.container(border=True):
+            st.markdown(f"**{JOB_LABELS.get(job['kind'], job['kind'])}** · #{job['id']} · "
+                        f"{STATUS_ICONS.get(job['status'], '')} {job['status']} · {job['created_at']}"
+                        + (f" · {job['owner']}" if owner is None and job["owner"] else ""))
+            if job["status"] in ACTIVE_STATUSES:
+                st.progress(job["progress"], text=job["message"] or "Waiting for a worker…")
+                continue
+            if job["status"] == "failed":
+                st.error(job["error"].split("\n\n")[0])
+            elif job["status"] == "interrupted":
+                st.warning("Interrupted by a restart — submit it again.")
+            else:
+                st.caption(_result_line(job))
+                result = job["result"] or {}
+                path = result.get("path") or result.get("file")
+                if path and os.path.exists(path):
+                    _download(job, path, result.get("file_name") or os.path.basename(path))
+            if st.button("🗑 Remove", key=f"job_forget_{job['id']}"):
+                forget_job(job)
+                st.rerun()
+
+
+def jobs_panel(owner=None, kinds=None, limit=10):
+    # while a job is queued or running the list redraws itself every few
+    # seconds without rerunning the rest of the page
+    active = any(j["status"] in ACTIVE_STATUSES for j in _jobs(owner, kinds, limit))
+    fragment = st.fragment(_job_list, run_every=JOB_POLL_SECONDS if active else None)
+    fragment(owner, kinds, limit, active)
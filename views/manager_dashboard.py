@@ -0,0 +1,50 @@
+# ==========================================
+# ZONE 9 — MANAGER DASHBOARD (FINAL & FIXED)
+# ==========================================
+import pandas as pd
+import streamlit as st
+
+from db import Query, db_count, db_parallel, db_select
+
+
+def render(username, role):
+    st.title("📊 Manager Dashboard")
+
+    # the team list is displayed below, so employees are fetched; logs are only counted
+    data = db_parallel({
+        "my_emps": lambda: db_select("employees", Query("firstname", "lastname", "username")
+                                     .eq("manager_username", username)),
+        "pending_logs": lambda: db_count("work_logs", Query().eq("manager_username", username)
+                                         .eq("status", "pending")),
+        "approved_logs": lambda: db_count("work_logs", Query().eq("manager_username", username)
+                                          .eq("status", "approved")),
+    })
+    my_emps = data["my_emps"] or []
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("My Employees", len(my_emps))
+    col2.metric("Pending Approvals", data["pending_logs"] or 0)
+    col3.metric("Approved Logs", data["approved_logs"] or 0)
+
+    st.markdown("### 👥 My Team")
+
+    if not my_emps:
+        st.info("You don't have employees yet.")
+        st.stop()
+
+    df = pd.DataFrame(my_emps)[["firstname", "lastname", "username"]]
+    df["Full Name"] = df["firstname"] + " " + df["lastname"]
+    df = df[["Full Name", "username"]]
+
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+    st.markdown("### Select an employee")
+
+    for emp in my_emps:
+        full = emp["firstname"] + " " + emp["lastname"]
+        uname = emp["username"]
+
+        if st.button(f"👤 {full}", key=f"open_{uname}"):
+            st.session_state.view_payroll_for = uname
+            st.session_state.menu = "📊 Payroll"
+            st.rerun()
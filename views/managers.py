@@ -0,0 +1,32 @@
+# ==========================================
+# ZONE 11 — MANAGERS LIST (VIEW / DELETE / EDIT)
+# ==========================================
+import pandas as pd
+import streamlit as st
+
+from db import Query, db_delete, db_select
+
+
+def render(username, role):
+    st.title("📋 All Managers")
+
+    managers = db_select("employees", Query("firstname", "lastname", "username", "address")
+                         .eq("role", "manager")) or []
+
+    if not managers:
+        st.info("No managers found.")
+    else:
+        df = pd.DataFrame(managers)[["firstname", "lastname", "username", "address"]]
+        st.dataframe(df, use_container_width=True, hide_index=True)
+
+        st.markdown("---")
+        st.subheader("🗑 Delete Manager")
+
+        usernames = [m["username"] for m in managers]
+        selected = st.selectbox("Select Manager", usernames)
+        delete_btn = st.button("Delete Manager")
+
+        if delete_btn:
+            db_delete("employees", Query().eq("username", selected))
+            st.success(f"Manager '{selected}' deleted.")
+            st.stop()
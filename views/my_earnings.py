@@ -0,0 +1,47 @@
+# ==========================================
+# ZONE 19 — EMPLOYEE EARNINGS
+# ==========================================
+from datetime import datetime
+
+import streamlit as st
+
+from payroll import frame_totals, payroll_totals
+from snapshots import load_period
+from views.common import as_number
+
+
+def render(username, role):
+    st.title("💰 My Earnings")
+
+    # dates, not timestamps, so the query is identical across reruns
+    today = datetime.now().date()
+    month_start = today.replace(day=1)
+    df, snapshot = load_period(
+        username_filter=username,
+        start_date=month_start,
+        end_date=today
+    )
+
+    if df.empty:
+        st.info("No earnings yet.")
+        st.stop()
+
+    st.dataframe(df[[
+        "date", "Day", "wijk", "segments",
+        "Wijk Earn (€)", "Trip Cost (€)", "Day Earn (€)", "status"
+    ]], use_container_width=True)
+
+    st.markdown("---")
+
+    col1, col2, col3 = st.columns(3)
+
+    if snapshot:
+        totals = frame_totals(df)
+        approved = frame_totals(df[df["status"] == "approved"])
+    else:
+        totals = payroll_totals(username_filter=username, start_date=month_start, end_date=today)
+        approved = payroll_totals(username_filter=username, start_date=month_start, end_date=today,
+                                  status="approved")
+    col1.metric("Total Earn (€)", f"€ {totals['Day Earn (€)']:,.2f}")
+    col2.metric("Total KM", as_number(totals["trip_km"]))
+    col3.metric("Approved Days", int(approved["rows"]))
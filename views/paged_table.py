@@ -0,0 +1,88 @@
+# ==========================================
+# PAGED TABLES (EMPLOYEES, PAYROLL)
+# ==========================================
+# Search, sort and paging controls over a table where only the visible page
+# is sent to the browser. query_table turns the controls into PostgREST
+# parameters (or=ilike filter, order, limit, offset) plus one HEAD count;
+# frame_table slices an already loaded DataFrame. Changing the search, sort
+# or page size goes back to page 1.
+import math
+
+import pandas as pd
+import streamlit as st
+
+from db import db_count, db_select
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+def _controls(key, columns, default_sort):
+    def first_page():
+        st.session_state[f"{key}_page"] = 1
+
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    search = col1.text_input("🔍 Search", key=f"{key}_search", on_change=first_page).strip()
+    sort = col2.selectbox("Sort by", columns, index=columns.index(default_sort), key=f"{key}_sort",
+                          on_change=first_page)
+    desc = col3.toggle("Descending", key=f"{key}_desc", on_change=first_page)
+    size = col4.selectbox("Rows", PAGE_SIZES, index=1, key=f"{key}_size", on_change=first_page)
+    return search, sort, desc, size
+
+
+def _page(key, total, size):
+    # the requested page, clamped to what exists now; the widget itself comes after the table
+    pages = max(math.ceil(total / size), 1)
+    page = min(max(int(st.session_state.get(f"{key}_page", 1)), 1), pages)
+    st.session_state[f"{key}_page"] = page
+    return page, pages
+
+
+def _pager(key, page, pages, total, size, shown):
+    col1, col2 = st.columns([1, 3])
+    col1.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+    first = (page - 1) * size + 1 if shown else 0
+    col2.caption(f"Rows {first:,}–{first + shown - 1 if shown else 0:,} of {total:,}")
+
+
+def query_table(key, table, query, columns, search_columns, default_sort):
+    # query: a Query holding the fixed filters; returns the rows on screen
+    search, sort, desc, size = _controls(key, columns, default_sort)
+    filtered = query.copy().select(*columns)
+    if search:
+        # % and _ typed by the user are matched literally, not as LIKE wildcards
+        text = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        filtered.or_(*[(c, "ilike", f"*{text}*") for c in search_columns])
+    total = db_count(table, filtered.copy().select("id")) or 0
+    page, pages = _page(key, total, size)
+    # id breaks ties so rows with the same sort value keep their page
+    filtered.order(sort, desc).order("id").limit(size).offset((page - 1) * size)
+    rows = db_select(table, filtered) or []
+    st.dataframe(pd.DataFrame(rows, columns=columns), use_container_width=True, hide_index=True)
+    _pager(key, page, pages, total, size, len(rows))
+    return rows
+
+
+def _contains(series, text):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # match each distinct value once, then map back to the rows
+        hits = series.cat.categories.astype(str).str.contains(text, case=False, regex=False)
+        return series.isin(series.cat.categories[hits])
+    return series.astype(str).str.contains(text, case=False, regex=False)
+
+
+def frame_table(key, df, search_columns, default_sort):
+    # df: a frame already in memory (e.g. from the session cache); returns the page shown
+    columns = list(df.columns)
+    search, sort, desc, size = _controls(key, columns, default_sort)
+    if search:
+        mask = _contains(df[search_columns[0]], search)
+        for c in search_columns[1:]:
+            mask |= _contains(df[c], search)
+        df = df[mask]
+    page, pages = _page(key, len(df), size)
+    # stable in both directions, so equal values keep their page; empty values last
+    df = df.sort_values(sort, ascending=not desc, na_position="last", kind="stable")
+    shown = df.iloc[(page - 1) * size:page * size]
+    st.dataframe(shown, use_container_width=True, hide_index=True)
+    _pager(key, page, pages, len(df), size, len(shown))
+    return shown
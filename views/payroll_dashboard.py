@@ -0,0 +1,95 @@
+# ==========================================
+# ZONE 18 — PAYROLL DASHBOARD (FINAL & FIXED)
+# ==========================================
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+from db import db_parallel, session_cached
+from export import EXPORT_FORMATS
+from jobs import submit_job
+from payroll import frame_totals, memory_per_row, payroll_totals
+from snapshots import ALL_SCOPE, find_snapshot, load_period, reopen_period
+from views.common import as_number
+from views.jobs_panel import jobs_panel
+from views.paged_table import frame_table
+
+
+def render(username, role):
+    st.title("📊 Payroll Dashboard")
+
+    # detect redirect from dashboard
+    if "view_payroll_for" in st.session_state and st.session_state.view_payroll_for:
+        selected_user = st.session_state.view_payroll_for
+        st.session_state.view_payroll_for = None   # RESET HERE
+    else:
+        selected_user = "All"
+
+    # date filters
+    start_date = st.date_input("📅 Start Date", datetime.now() - timedelta(days=30))
+    end_date   = st.date_input("📅 End Date", datetime.now())
+
+    payroll_filters = dict(
+        username_filter=None if selected_user == "All" else selected_user,
+        manager_filter=None if role == "admin" else username,
+        start_date=start_date,
+        end_date=end_date
+    )
+    # closed periods are served from their snapshot, open ones live
+    close_scope = ALL_SCOPE if role == "admin" else username
+    snapshot = find_snapshot(close_scope, start_date, end_date)
+    # the frame is kept for the session, so paging, sorting and searching the
+    # table below slice it instead of loading the period again
+    frame_key = repr((sorted(payroll_filters.items()), close_scope, snapshot and snapshot["closed_at"]))
+    calls = {
+        "df": lambda: session_cached("FRAME load_period", ("work_logs", "wijk"), frame_key,
+                                     lambda: load_period(**payroll_filters, scope=close_scope)[0]),
+    }
+    if not snapshot:
+        calls["totals"] = lambda: payroll_totals(**payroll_filters)
+    data = db_parallel(calls)
+    df = data["df"]
+    totals = frame_totals(df) if snapshot else data["totals"]
+
+    if snapshot:
+        st.info(f"🔒 Closed period {snapshot['start']} → {snapshot['end']} — closed by "
+                f"{snapshot['closed_by']} on {snapshot['closed_at']}.")
+        if role == "admin" and st.button("🔓 Reopen Period"):
+            reopen_period(snapshot)
+            st.rerun()
+
+    if df.empty:
+        st.info("No data available.")
+        st.stop()
+
+    frame_table("payroll", df, ["username", "wijk", "status", "manager_username", "Day"], "date")
+    st.caption(f"{len(df):,} rows · {memory_per_row(df):,.0f} bytes per row in memory")
+
+    st.markdown("---")
+    st.subheader("Summary")
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Total Earn (€)", f"€ {totals['Day Earn (€)']:,.2f}")
+    col2.metric("Total Segments", as_number(totals["segments"]))
+    col3.metric("Total KM", as_number(totals["trip_km"]))
+    col4.metric("Trip Cost (€)", f"€ {totals['Trip Cost (€)']:,.2f}")
+
+    if not snapshot:
+        st.markdown("---")
+        if st.button("🔒 Close Period"):
+            job_id = submit_job("close_period", dict(scope=close_scope, start=start_date, end=end_date,
+                                                     closed_by=username), owner=username)
+            st.success(f"Closing {start_date} → {end_date} in the background (job #{job_id}).")
+
+    st.markdown("---")
+    st.subheader("⬇ Export")
+    export_format = st.selectbox("Format", list(EXPORT_FORMATS))
+    if st.button("Prepare Export"):
+        # closed periods are exported from their snapshot (see jobs.export_job)
+        job_id = submit_job("export", dict(payroll_filters, scope=close_scope, ext=EXPORT_FORMATS[export_format]),
+                            owner=username)
+        st.success(f"Preparing the {export_format} export in the background (job #{job_id}).")
+
+    st.markdown("---")
+    st.subheader("🧵 Background Jobs")
+    jobs_panel(username, kinds={"close_period", "export"})
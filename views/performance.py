@@ -0,0 +1,92 @@
+# ==========================================
+# ZONE 19B — PERFORMANCE (ADMIN)
+# ==========================================
+import pandas as pd
+import streamlit as st
+
+from outbox import dead_rows, outbox_stats, retry_dead
+from tracing import clear_spans, spans_jsonl, trace_context, trace_spans
+
+
+def outbox_section():
+    stats = outbox_stats()
+    st.subheader("📮 Submission outbox")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Waiting", stats["depth"])
+    col2.metric("Oldest waiting", f"{stats['oldest_age_s']:.0f} s")
+    col3.metric("Flush latency p50 / p95",
+                "—" if stats["flush_latency_p50_s"] is None else
+                f"{stats['flush_latency_p50_s']:.2f} / {stats['flush_latency_p95_s']:.2f} s")
+    col4.metric("Dead rows", stats["dead_rows"])
+    st.caption(f"{stats['flushed']:,} sent in {stats['batches']:,} batches "
+               f"({stats['duplicates']:,} already present), {stats['failures']:,} failed attempts"
+               + ("" if stats["batch_p50_ms"] is None else f", batch p50 {stats['batch_p50_ms']:.0f} ms"))
+    if stats["dead_rows"]:
+        st.dataframe(pd.DataFrame(dead_rows()), use_container_width=True, hide_index=True)
+        if st.button("🔁 Retry dead rows"):
+            st.success(f"{retry_dead()} row(s) queued again.")
+
+
+def render(username, role):
+    st.title("⏱ Performance")
+    outbox_section()
+
+    scope = st.radio("Sessions", ["This session", "All sessions"], horizontal=True)
+    spans = trace_spans(trace_context()["session"] if scope == "This session" else None)
+
+    if not spans:
+        st.info("No traced calls yet.")
+        st.stop()
+
+    df = pd.DataFrame(spans)
+    df["page"] = df["page"].fillna("—")
+    df["table"] = df["table"].fillna("—")
+    df["session"] = df["session"].fillna("—").str[:8]
+
+    # data-layer time per rerun: top-level spans only, fan-out workers are nested
+    runs = df[df["depth"] == 0].groupby(["page", "session", "run"], dropna=False).agg(
+        ms=("ms", "sum"), requests=("requests", "sum"), bytes=("bytes", "sum")
+    ).reset_index()
+
+    st.subheader("Per page (data layer time per rerun)")
+    st.dataframe(runs.groupby("page").agg(
+        reruns=("ms", "size"),
+        p50_ms=("ms", "median"),
+        p95_ms=("ms", lambda x: x.quantile(0.95)),
+        requests_per_run=("requests", "mean"),
+        kb_per_run=("bytes", lambda x: x.mean() / 1024),
+    ).round(1), use_container_width=True)
+
+    st.subheader("Per call")
+    st.dataframe(df.groupby(["page", "op", "table"]).agg(
+        calls=("ms", "size"),
+        p50_ms=("ms", "median"),
+        p95_ms=("ms", lambda x: x.quantile(0.95)),
+        max_ms=("ms", "max"),
+        avg_rows=("rows", "mean"),
+        cached=("requests", lambda x: int((x == 0).sum())),
+        kb=("bytes", lambda x: x.sum() / 1024),
+        errors=("error", "count"),
+    ).round(1).reset_index(), use_container_width=True, hide_index=True)
+
+    st.subheader("Per session")
+    st.dataframe(runs.groupby("session").agg(
+        pages=("page", "nunique"),
+        reruns=("run", "nunique"),
+        data_ms=("ms", "sum"),
+        requests=("requests", "sum"),
+        kb=("bytes", lambda x: x.sum() / 1024),
+    ).round(1), use_container_width=True)
+
+    errors = df[df["error"].notna()]
+    if not errors.empty:
+        st.subheader("Recent errors")
+        st.dataframe(errors[["page", "op", "table", "status", "error"]].tail(50),
+                     use_container_width=True, hide_index=True)
+
+    col1, col2 = st.columns(2)
+    col1.download_button("⬇ Download JSON lines", data=spans_jsonl(spans),
+                         file_name="delvero_trace.jsonl", mime="application/json")
+    if col2.button("🗑 Clear traces"):
+        clear_spans()
+        st.rerun()
@@ -0,0 +1,85 @@
+# ==========================================
+# ZONE 15 — EMPLOYEE: SUBMIT WORK
+# ==========================================
+from datetime import datetime
+
+import streamlit as st
+
+from db import Query, db_insert_many, db_select
+from outbox import enqueue, outbox_ready, outbox_stats
+from views.common import work_log_row
+from wijk_index import wijk_index
+
+WIJK_SUGGESTIONS = 8
+
+
+def _pick_suggestion(i):
+    # a clicked suggestion replaces what was typed
+    choice = st.session_state[f"wijk_pick_{i}"]
+    if choice:
+        st.session_state[f"wijk_input_{i}"] = choice
+    st.session_state[f"wijk_pick_{i}"] = None
+
+
+def render(username, role):
+    st.title("📝 Submit Daily Work")
+
+    today = datetime.today().date()
+    index = wijk_index()
+
+    # not a form: each typed wijk reruns the page to suggest names and fill in its depot
+    work_date = st.date_input("Date", value=today)
+    st.markdown("#### Enter Wijk(s) You Delivered Today")
+    wijk_inputs = []
+    for i in range(3):
+        typed = st.text_input(f"Wijk #{i+1}", key=f"wijk_input_{i}").strip()
+        matched = index.resolve(typed)
+        if matched:
+            st.caption(f"✅ {matched['wijk_name']} · 🏢 {matched['depot']}")
+            wijk_inputs.append((matched["wijk_name"], matched["depot"]))
+            continue
+        if typed:
+            suggestions = index.complete(typed, WIJK_SUGGESTIONS)
+            if suggestions:
+                st.selectbox("Did you mean", suggestions, index=None, key=f"wijk_pick_{i}",
+                             placeholder=f"{len(suggestions)} matching wijk(s)",
+                             on_change=_pick_suggestion, args=(i,))
+            else:
+                st.caption("⚠ Unknown wijk — it will be priced by its segments.")
+        depot_col = st.text_input(f"Depot for Wijk #{i+1}", key=f"depot_input_{i}")
+        wijk_inputs.append((typed, depot_col.strip()))
+
+    trip_km = st.number_input("Total Trip KM", min_value=0, max_value=300)
+    notes = st.text_area("Notes (optional)")
+    submit = st.button("Submit Work")
+    queued = outbox_ready()
+    if queued and not submit:
+        waiting = outbox_stats(username)
+        if waiting["depth"]:
+            st.caption(f"⏳ {waiting['depth']} work log(s) queued on the server, not yet in the database.")
+
+    if submit:
+        emp = db_select("employees", Query("manager_username").eq("username", username))
+        if emp and isinstance(emp, list) and len(emp) > 0:
+            manager_username = emp[0].get("manager_username")
+        else:
+            st.error("Manager not found for this user.")
+            st.stop()
+
+        rows = []
+        for wijk_name, depot in wijk_inputs:
+            if not wijk_name:
+                continue
+            rows.append(work_log_row(username, manager_username, work_date, wijk_name,
+                                     depot, trip_km, notes))
+
+        if not rows:
+            st.warning("⚠ No wijk entries provided.")
+        elif queued:
+            # queued in the app server's outbox and acknowledged now; outbox.py sends it to Supabase
+            enqueue(rows, owner=username)
+            st.success(f"✅ {len(rows)} work log(s) received — queued on the server for the database.")
+        elif db_insert_many("work_logs", rows) is None:
+            st.error("❌ Nothing was saved, please submit again.")
+        else:
+            st.success(f"✅ {len(rows)} work log(s) submitted successfully!")
@@ -0,0 +1,40 @@
+# ==========================================
+# ZONE 14 — WIJK MANAGEMENT (ADMIN + MANAGER)
+# ==========================================
+import pandas as pd
+import streamlit as st
+
+from db import db_insert
+from wijk_index import wijk_table
+
+
+def render(username, role):
+    st.title("🗂 Wijk Management")
+
+    with st.form("add_wijk_form"):
+        wijk_name = st.text_input("Wijk Name")
+        depot = st.text_input("Depot")
+        segments = st.number_input("Segments", min_value=1, max_value=10)
+        base_price = st.number_input("Base Price (€)", min_value=0.0)
+        submit = st.form_submit_button("Create Wijk")
+
+    if submit:
+        db_insert("wijk", {
+            "wijk_name": wijk_name,
+            "depot": depot,
+            "segments": segments,
+            "base_price": base_price,
+            "created_by": username
+        })
+        st.success("Wijk added successfully!")
+        st.stop()
+
+    st.markdown("---")
+    st.subheader("📋 Existing Wijks")
+
+    wijks = wijk_table()
+    if wijks:
+        df = pd.DataFrame(wijks)[["wijk_name", "depot", "segments", "base_price", "created_by"]]
+        st.dataframe(df, use_container_width=True, hide_index=True)
+    else:
+        st.info("No wijks created yet.")
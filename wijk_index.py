@@ -0,0 +1,95 @@
+# ==========================================
+# WIJK INDEX (EXACT, NORMALIZED, PREFIX)
+# ==========================================
+# One in-memory index over the wijk table, shared by Submit Work (autocomplete
+# and depot auto-fill), Import Logs and the payroll price map. It is rebuilt
+# only when the rows behind it change: db.py's reference cache hands back the
+# same row objects until the table is written or its TTL expires, so one
+# identity check per call tells whether a rebuild is needed.
+import re
+import threading
+
+from db import Query, db_select, on_write
+
+# one projection for every wijk read, so they all share one reference-cache entry
+WIJK_COLUMNS = ["wijk_name", "depot", "segments", "base_price", "created_by"]
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_END = ""  # trie key holding the names that end at a node
+
+
+def wijk_table():
+    return db_select("wijk", Query(*WIJK_COLUMNS)) or []
+
+
+def normalize(name):
+    # "w-012 ", "W 012" and "W012" all become "w012"
+    return _NON_ALNUM.sub("", str(name).casefold())
+
+
+class WijkIndex:
+    def __init__(self, rows):
+        self.rows = rows
+        self.exact = {}
+        for w in rows:
+            self.exact[w["wijk_name"]] = w  # the later row wins, as in the price map
+        self.names = sorted(self.exact)
+        self.price_map = {name: w.get("base_price", 0) for name, w in self.exact.items()}
+        # normalized form -> name; forms shared by several names resolve to nothing,
+        # but every name stays in the trie so autocomplete still offers them all
+        self.normalized = {}
+        self.trie = {}
+        for name in self.names:
+            key = normalize(name)
+            self.normalized[key] = None if key in self.normalized else name
+            node = self.trie
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node.setdefault(_END, []).append(name)
+
+    def resolve(self, text):
+        # the wijk row for a typed name, exact first, then by normalized form
+        if not text:
+            return None
+        if text in self.exact:
+            return self.exact[text]
+        name = self.normalized.get(normalize(text))
+        return self.exact[name] if name else None
+
+    def complete(self, prefix, limit=10):
+        # up to limit names whose normalized form starts with the normalized
+        # prefix, in normalized order; the walk stops once limit are found
+        node = self.trie
+        for ch in normalize(prefix):
+            node = node.get(ch)
+            if node is None:
+                return []
+        found, stack = [], [node]
+        while stack and len(found) < limit:
+            node = stack.pop()
+            found += node.get(_END, [])
+            stack += [node[ch] for ch in sorted(node, reverse=True) if ch != _END]
+        return found[:limit]
+
+
+_lock = threading.Lock()
+_index = None
+
+
+def wijk_index(rows=None):
+    # rows: an already fetched wijk table (e.g. from a parallel read)
+    global _index
+    if rows is None:
+        rows = wijk_table()
+    with _lock:
+        index = _index
+        if index is None or len(index.rows) != len(rows) or (rows and index.rows[0] is not rows[0]):
+            index = _index = WijkIndex(rows)
+        return index
+
+
+@on_write
+def _index_on_write(table, method, rows):
+    global _index
+    if table == "wijk":
+        with _lock:
+            _index = None
@@ -0,0 +1,242 @@
+# ==========================================
+# LOCAL WORK_LOGS CACHE (DAY PARTITIONS)
+# ==========================================
+# work_logs are mirrored into a local SQLite file, partitioned by day. Each
+# day is downloaded once per scope (an employee, a manager, both, or "_all")
+# and then read locally, so moving the date range only fetches the days not
+# seen yet. New rows arrive through the id watermark, writes made through
+# db.py are applied from on_write, and days loaded more than
+# WORKLOG_CACHE_REFRESH_SECONDS ago are fetched again, which also picks up
+# edits made by other processes.
+import os
+import sqlite3
+import threading
+import time
+from datetime import timedelta
+
+import pandas as pd
+
+import db
+from db import Query, db_select, db_select_pages, on_write
+
+WORKLOG_CACHE_ENABLED = os.environ.get("DELVERO_WORKLOG_CACHE", "1") != "0"
+WORKLOG_CACHE_PATH = os.environ.get(
+    "DELVERO_WORKLOG_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "work_logs.sqlite"),
+)
+WORKLOG_CACHE_REFRESH_SECONDS = float(os.environ.get("DELVERO_WORKLOG_CACHE_REFRESH", "900"))
+ALL_SCOPE = "_all"
+SCOPE_KEYS_VERSION = "2"
+LOG_COLUMNS = ["id", "username", "date", "wijk", "segments", "trip_km", "status", "manager_username"]
+
+_SCHEMA = """
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS logs (
+    id INTEGER PRIMARY KEY, day TEXT NOT NULL, username TEXT, manager_username TEXT,
+    wijk TEXT, segments NUMERIC, trip_km NUMERIC, status TEXT
+);
+CREATE INDEX IF NOT EXISTS logs_day ON logs (day);
+CREATE TABLE IF NOT EXISTS days (
+    scope TEXT NOT NULL, day TEXT NOT NULL, loaded_at REAL NOT NULL, PRIMARY KEY (scope, day)
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+_lock = threading.RLock()
+_stats = {"days_hit": 0, "days_fetched": 0, "rows_fetched": 0, "delta_rows": 0}
+
+
+def _connect():
+    os.makedirs(os.path.dirname(WORKLOG_CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(WORKLOG_CACHE_PATH, timeout=30)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _get_meta(conn, key):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _set_meta(conn, key, value):
+    conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(value)))
+
+
+def _clear(conn):
+    conn.execute("DELETE FROM logs")
+    conn.execute("DELETE FROM days")
+    conn.execute("DELETE FROM meta WHERE key = 'max_id'")
+
+
+def _upsert(conn, rows):
+    conn.executemany(
+        "INSERT OR REPLACE INTO logs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [(r["id"], str(r["date"])[:10], r.get("username"), r.get("manager_username"), r.get("wijk"),
+          r.get("segments"), r.get("trip_km"), r.get("status")) for r in rows],
+    )
+
+
+def _scope(username_filter, manager_filter):
+    # both filters count: "user:x" holds all of x's logs, "user:x|manager:B" only those under B
+    parts = []
+    if username_filter:
+        parts.append(f"user:{username_filter}")
+    if manager_filter:
+        parts.append(f"manager:{manager_filter}")
+    return "|".join(parts) or ALL_SCOPE
+
+
+def _covering_scopes(username_filter, manager_filter):
+    # scopes whose loaded days hold every log of this one
+    scopes = {_scope(username_filter, manager_filter), ALL_SCOPE}
+    if username_filter and manager_filter:
+        scopes |= {_scope(username_filter, None), _scope(None, manager_filter)}
+    return sorted(scopes)
+
+
+def _filters(username_filter, manager_filter):
+    # SQL condition and params limiting logs to the filters
+    sql, params = "", []
+    if username_filter:
+        sql += " AND username = ?"
+        params.append(username_filter)
+    if manager_filter:
+        sql += " AND manager_username = ?"
+        params.append(manager_filter)
+    return sql, params
+
+
+def _runs(days):
+    # consecutive days grouped into (first, last) ranges, one fetch each
+    runs = []
+    for day in days:
+        if runs and runs[-1][1] + timedelta(days=1) == day:
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    return runs
+
+
+def _sync_delta(conn):
+    # rows above the id watermark, whatever their day
+    watermark = _get_meta(conn, "max_id")
+    if watermark is None:
+        # first sync: start from the current highest id, the days come with their own fetch
+        latest = db_select("work_logs", Query("id").order("id", desc=True).limit(1), session=False)
+        if not isinstance(latest, list):
+            raise RuntimeError("work_logs watermark could not be read")
+        _set_meta(conn, "max_id", latest[0]["id"] if latest else 0)
+        return
+    max_id = int(watermark)
+    for rows in db_select_pages("work_logs", Query(*LOG_COLUMNS).gt("id", max_id)):
+        _upsert(conn, rows)
+        _stats["delta_rows"] += len(rows)
+        max_id = max(max_id, max(int(r["id"]) for r in rows))
+    _set_meta(conn, "max_id", max_id)
+
+
+def _fill_days(conn, username_filter, manager_filter, start, end):
+    scope = _scope(username_filter, manager_filter)
+    covering = _covering_scopes(username_filter, manager_filter)
+    now = time.time()
+    fresh = {row[0] for row in conn.execute(
+        f"SELECT day FROM days WHERE scope IN ({', '.join('?' * len(covering))}) "
+        "AND day BETWEEN ? AND ? AND loaded_at > ?",
+        (*covering, start.isoformat(), end.isoformat(), now - WORKLOG_CACHE_REFRESH_SECONDS),
+    )}
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    missing = [d for d in days if d.isoformat() not in fresh]
+    _stats["days_hit"] += len(days) - len(missing)
+    where, params = _filters(username_filter, manager_filter)
+    for first, last in _runs(missing):
+        # drop this scope's copy first so rows deleted remotely go away too
+        conn.execute(f"DELETE FROM logs WHERE day BETWEEN ? AND ?{where}",
+                     [first.isoformat(), last.isoformat(), *params])
+        query = Query(*LOG_COLUMNS).gte("date", first).lte("date", last)
+        if username_filter:
+            query.eq("username", username_filter)
+        if manager_filter:
+            query.eq("manager_username", manager_filter)
+        for rows in db_select_pages("work_logs", query):
+            _upsert(conn, rows)
+            _stats["rows_fetched"] += len(rows)
+        span = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+        conn.executemany("INSERT OR REPLACE INTO days VALUES (?, ?, ?)",
+                         [(scope, d.isoformat(), now) for d in span])
+        _stats["days_fetched"] += len(span)
+
+
+def cached_logs(username_filter=None, manager_filter=None, start_date=None, end_date=None):
+    # work_logs of [start_date, end_date] as a DataFrame, the columns load_payroll selects
+    start, end = pd.Timestamp(start_date).date(), pd.Timestamp(end_date).date()
+    with _lock:
+        conn = _connect()
+        try:
+            with conn:
+                if _get_meta(conn, "source") != db.SUPABASE_URL:
+                    _clear(conn)
+                    _set_meta(conn, "source", db.SUPABASE_URL)
+                if _get_meta(conn, "scope_keys") != SCOPE_KEYS_VERSION:
+                    # older files keyed "user:x" days loaded under a manager filter too
+                    conn.execute("DELETE FROM days")
+                    _set_meta(conn, "scope_keys", SCOPE_KEYS_VERSION)
+                _sync_delta(conn)
+                _fill_days(conn, username_filter, manager_filter, start, end)
+            where, params = _filters(username_filter, manager_filter)
+            return pd.read_sql_query(
+                "SELECT username, day AS date, wijk, segments, trip_km, status, manager_username "
+                f"FROM logs WHERE day BETWEEN ? AND ?{where} ORDER BY id",
+                conn, params=[start.isoformat(), end.isoformat(), *params],
+            )
+        finally:
+            conn.close()
+
+
+def clear_worklog_cache():
+    with _lock:
+        if not os.path.exists(WORKLOG_CACHE_PATH):
+            return
+        conn = _connect()
+        try:
+            with conn:
+                _clear(conn)
+        finally:
+            conn.close()
+
+
+def worklog_cache_stats():
+    with _lock:
+        return dict(_stats)
+
+
+@on_write
+def _cache_on_write(table, method, rows):
+    if table != "work_logs" or not os.path.exists(WORKLOG_CACHE_PATH):
+        return
+    if isinstance(rows, dict):
+        rows = [rows]
+    if method not in ("POST", "PATCH") or not isinstance(rows, list) \
+            or not all(isinstance(r, dict) for r in rows):
+        placeable, stale_days, everything = [], set(), True
+    else:
+        placeable = [r for r in rows if all(c in r for c in LOG_COLUMNS)]
+        rest = [r for r in rows if not all(c in r for c in LOG_COLUMNS)]
+        # new rows with an id come in through the id watermark on the next sync
+        # (e.g. outbox batches, whose rows use employee_username / wijk_name);
+        # anything else is re-fetched for its day
+        rest = [r for r in rest if not (method == "POST" and "id" in r)]
+        stale_days = {str(r["date"])[:10] for r in rest if r.get("date")}
+        everything = any(not r.get("date") for r in rest)
+    if not placeable and not stale_days and not everything:
+        return
+    with _lock:
+        conn = _connect()
+        try:
+            with conn:
+                if everything:
+                    _clear(conn)
+                    return
+                _upsert(conn, placeable)
+                conn.executemany("DELETE FROM days WHERE day = ?", [(d,) for d in stale_days])
+        finally:
+            conn.close()